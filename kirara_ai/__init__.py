@@ -1,5 +1,17 @@
+from typing import TYPE_CHECKING
+
 from .config.config_loader import ConfigLoader
-from .entry import init_application, run_application
 from .logger import get_logger
 
+if TYPE_CHECKING:
+    from .entry import init_application, run_application
+
 __all__ = ["init_application", "run_application", "get_logger", "ConfigLoader"]
+
+
+def __getattr__(name: str):
+    # 入口模块会加载所有子系统，仅在真正需要时导入
+    if name in ("init_application", "run_application"):
+        from . import entry
+        return getattr(entry, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
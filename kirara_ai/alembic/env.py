@@ -16,7 +16,7 @@ if config.config_file_name is not None:
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-from kirara_ai.database.manager import Base
+from kirara_ai.database.base import Base
 from kirara_ai.tracing.models import LLMRequestTrace  # noqa: F401
 
 target_metadata = Base.metadata
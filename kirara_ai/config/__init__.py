@@ -1,14 +1,12 @@
 import os
+from pathlib import Path
 
 # 读取DATA_PATH环境变量，若未能找到则以当前工作目录为根文件夹存储在$PWD/data目录下。
-DATA_PATH = os.path.abspath(
-    os.environ.get("DATA_PATH", os.path.join(os.getcwd(), "data"))
-)
+_data_path_env = os.environ.get("DATA_PATH")
+DATA_PATH_P = (Path(_data_path_env) if _data_path_env else Path.cwd() / "data").resolve(strict=False)
+DATA_PATH = str(DATA_PATH_P)
 # 按照规范插件应该在PLUGIN_PATH目录下存储对应的文件。
-PLUGIN_PATH = os.path.join(DATA_PATH, "plugins")
+PLUGIN_PATH = str(DATA_PATH_P / "plugins")
 
-if os.path.exists(DATA_PATH) is False:
-    os.makedirs(DATA_PATH)
-
-if os.path.exists(PLUGIN_PATH) is False:
-    os.makedirs(PLUGIN_PATH)
+os.makedirs(DATA_PATH, exist_ok=True)
+os.makedirs(PLUGIN_PATH, exist_ok=True)
@@ -8,9 +8,9 @@ from pydantic.json_schema import GenerateJsonSchema, JsonSchemaValue
 from ruamel.yaml import YAML
 
 from ..logger import get_logger
-from . import DATA_PATH
+from . import DATA_PATH_P
 
-CONFIG_FILE = os.path.join(DATA_PATH, "config.yaml")
+CONFIG_FILE = str(DATA_PATH_P / "config.yaml")
 
 T = TypeVar("T", bound=BaseModel)
 
@@ -1,3 +1,16 @@
-from kirara_ai.database.manager import Base, DatabaseManager, metadata
+from typing import TYPE_CHECKING
 
-__all__ = ["Base", "DatabaseManager", "metadata"] 
\ No newline at end of file
+from kirara_ai.database.base import Base, metadata
+
+if TYPE_CHECKING:
+    from kirara_ai.database.manager import DatabaseManager
+
+__all__ = ["Base", "DatabaseManager", "metadata"]
+
+
+def __getattr__(name: str):
+    # 延迟导入 DatabaseManager，只需要 ORM 基类的模块不必加载 alembic 和数据库引擎
+    if name == "DatabaseManager":
+        from kirara_ai.database.manager import DatabaseManager
+        return DatabaseManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,5 @@
+from sqlalchemy.orm import declarative_base
+
+# 创建Base类，用于所有ORM模型
+Base = declarative_base()
+metadata = Base.metadata
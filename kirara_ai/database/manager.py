@@ -1,3 +1,4 @@
+import json
 import os
 from typing import Optional
 
@@ -5,25 +6,66 @@ from alembic import command
 from alembic.config import Config
 from alembic.runtime.migration import MigrationContext
 from alembic.script import ScriptDirectory
-from sqlalchemy import MetaData, create_engine
-from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import NullPool
 
+from kirara_ai.database.base import Base, metadata  # noqa: F401
 from kirara_ai.ioc.container import DependencyContainer
 from kirara_ai.logger import get_logger
 
 logger = get_logger("DB")
 
-# 创建Base类，用于所有ORM模型
-Base = declarative_base()
-metadata = MetaData()
+# 同步驱动对应的异步驱动
+ASYNC_DRIVERS = {
+    "sqlite": "aiosqlite",
+    "postgresql": "asyncpg",
+    "mysql": "aiomysql",
+}
+
+# SQLite 连接参数：WAL 模式下读写互不阻塞，NORMAL 同步级别在 WAL 下仍能保证数据库一致性
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-65536",
+)
+
+# 非 SQLite 数据库的连接池参数：按 CPU 数量扩大连接池，取用前探测连接是否存活，
+# LIFO 取用让少量热连接被反复复用，空闲过久的连接定期重建
+SERVER_POOL_OPTIONS = {
+    "pool_size": min(32, (os.cpu_count() or 4) * 4),
+    "max_overflow": 8,
+    "pool_pre_ping": True,
+    "pool_recycle": 1800,
+    "pool_use_lifo": True,
+}
+
+
+def _apply_sqlite_pragmas(engine: Engine) -> None:
+    """为 SQLite 引擎的每个新连接设置性能相关的 PRAGMA"""
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in SQLITE_PRAGMAS:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
 
 class DatabaseManager:
     """数据库管理器，负责管理数据库连接和会话"""
 
     def __init__(self, container: DependencyContainer, database_url: Optional[str] = None, is_debug: bool = False):
         self.container = container
-        self.engine = None
-        self.session_factory = None
+        self.engine: Optional[Engine] = None
+        self.session_factory: Optional[sessionmaker[Session]] = None
+        self.async_engine: Optional[AsyncEngine] = None
+        self.async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
         self.data_dir = "./data/db"
         self.db_path = os.path.join(self.data_dir, "kirara.db")
         self.database_url = database_url
@@ -40,7 +82,16 @@ class DatabaseManager:
         else:
             db_url = f"sqlite:///{self.db_path}"
 
-        self.engine = create_engine(db_url, echo=self.is_debug)
+        if make_url(db_url).get_backend_name() == "sqlite":
+            # 允许连接在线程池中的不同线程间使用，并在写锁竞争时等待而非立即报错
+            self.engine = create_engine(
+                db_url,
+                echo=self.is_debug,
+                connect_args={"check_same_thread": False, "timeout": 30},
+            )
+            _apply_sqlite_pragmas(self.engine)
+        else:
+            self.engine = create_engine(db_url, echo=self.is_debug, **SERVER_POOL_OPTIONS)
 
         # 创建session工厂
         self.session_factory = sessionmaker(bind=self.engine)
@@ -48,11 +99,25 @@ class DatabaseManager:
         # 运行数据库迁移
         self._run_migrations()
 
+        # 预热连接池，避免第一次查询时才承担建立连接的开销
+        self._warm_up()
+
         logger.info(f"Database initialized at {self.engine.url}")
 
+    def _warm_up(self):
+        """建立一个连接并执行简单查询，让连接池中留有可用连接"""
+        if self.engine is None:
+            raise RuntimeError("Database engine is not initialized")
+        with self.engine.connect() as connection:
+            if self.engine.dialect.name == "sqlite":
+                # 上次异常退出可能留下较大的 WAL 文件，启动时合并回主库并截断
+                connection.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            connection.exec_driver_sql("SELECT 1")
+
     def _run_migrations(self):
-        assert self.engine is not None
         """运行数据库迁移"""
+        if self.engine is None:
+            raise RuntimeError("Database engine is not initialized")
         try:
             # 获取 alembic.ini 的路径
             package_dir = os.path.dirname(os.path.dirname(__file__))
@@ -65,36 +130,105 @@ class DatabaseManager:
             else:
                 alembic_cfg = Config(alembic_ini_path)
                 
-            alembic_cfg.set_main_option("sqlalchemy.url", str(self.engine.url))
+            # str(url) 会隐藏密码，且 alembic 配置会对 % 做插值，需要转义
+            db_url = self.engine.url.render_as_string(hide_password=False)
+            alembic_cfg.set_main_option("sqlalchemy.url", db_url.replace("%", "%%"))
 
             # 检查是否需要迁移
             with self.engine.connect() as connection:
                 context = MigrationContext.configure(connection)
                 current_rev = context.get_current_revision()
-                
-                script = ScriptDirectory.from_config(alembic_cfg)
-                head_rev = script.get_current_head()
 
-                if current_rev != head_rev:
-                    logger.info("Running database migrations...")
-                    command.upgrade(alembic_cfg, "head")
-                    logger.info("Database migrations completed")
-                else:
-                    logger.info("Database schema is up to date")
+            head_rev = self._get_head_revision(alembic_cfg, os.path.join(package_dir, "alembic", "versions"))
+
+            if current_rev != head_rev:
+                logger.info("Running database migrations...")
+                command.upgrade(alembic_cfg, "head")
+                logger.info("Database migrations completed")
+            else:
+                logger.info("Database schema is up to date")
 
         except Exception as e:
             logger.error(f"Error during database migration: {e}")
             raise
 
+    def _get_head_revision(self, alembic_cfg: Config, versions_dir: str) -> Optional[str]:
+        """
+        获取迁移脚本的最新版本。
+        解析整个脚本目录的开销较大，结果会按迁移脚本的文件名、修改时间和大小缓存到数据目录中，脚本不变时直接复用。
+        """
+        scripts = sorted(
+            [entry.name, entry.stat().st_mtime_ns, entry.stat().st_size]
+            for entry in os.scandir(versions_dir)
+            if entry.name.endswith(".py")
+        )
+        cache_file = os.path.join(self.data_dir, ".alembic_head")
+        try:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["scripts"] == scripts:
+                return cached["head"]
+        except (OSError, ValueError, KeyError):
+            pass
+
+        head_rev = ScriptDirectory.from_config(alembic_cfg).get_current_head()
+        try:
+            tmp_file = f"{cache_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"scripts": scripts, "head": head_rev}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to cache alembic head revision: {e}")
+        return head_rev
+
     def get_session(self) -> Session:
         """获取数据库会话"""
-        if not self.session_factory:
+        session_factory = self.session_factory or self._ensure_initialized()
+        return session_factory()
+
+    def _ensure_initialized(self) -> sessionmaker[Session]:
+        """初始化数据库并返回会话工厂"""
+        self.initialize()
+        if self.session_factory is None:
+            raise RuntimeError("Database session factory is not initialized")
+        return self.session_factory
+
+    def _get_async_url(self, url: URL) -> URL:
+        """将同步数据库 URL 转换为对应异步驱动的 URL"""
+        backend = url.get_backend_name()
+        if backend not in ASYNC_DRIVERS:
+            raise ValueError(f"No async driver available for database backend: {backend}")
+        return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}")
+
+    def get_async_session(self) -> AsyncSession:
+        """
+        获取异步数据库会话，在事件循环中查询时不会阻塞循环。
+        异步引擎在首次使用时创建，与同步引擎共享同一个数据库。
+        """
+        if not self.engine:
             self.initialize()
-        assert self.session_factory is not None
-        return self.session_factory()
+        if self.engine is None:
+            raise RuntimeError("Database engine is not initialized")
+        if not self.async_session_factory:
+            url = self._get_async_url(make_url(self.engine.url))
+            if url.get_backend_name() == "sqlite":
+                # aiosqlite 的每个连接都占用一个工作线程，不做池化，随会话关闭
+                self.async_engine = create_async_engine(
+                    url, echo=self.is_debug, poolclass=NullPool, connect_args={"timeout": 30}
+                )
+                _apply_sqlite_pragmas(self.async_engine.sync_engine)
+            else:
+                self.async_engine = create_async_engine(url, echo=self.is_debug, **SERVER_POOL_OPTIONS)
+            self.async_session_factory = async_sessionmaker(self.async_engine, expire_on_commit=False)
+        return self.async_session_factory()
 
     def shutdown(self):
         """关闭数据库连接"""
+        if self.async_engine:
+            # 关闭时事件循环可能已经停止，直接丢弃异步连接池
+            self.async_engine.sync_engine.dispose(close=False)
+            self.async_engine = None
+            self.async_session_factory = None
         if self.engine:
             self.engine.dispose()
             logger.info("Database connection closed")
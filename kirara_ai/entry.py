@@ -1,69 +1,88 @@
 import asyncio
 import os
 import signal
-import time
-
-from packaging import version
-
-from kirara_ai.config.config_loader import ConfigLoader
-from kirara_ai.config.global_config import GlobalConfig
-from kirara_ai.database import DatabaseManager
-from kirara_ai.events.application import ApplicationStarted, ApplicationStopping
-from kirara_ai.events.event_bus import EventBus
-from kirara_ai.im.im_registry import IMRegistry
-from kirara_ai.im.manager import IMManager
-from kirara_ai.internal import shutdown_event
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count
+from typing import Awaitable, Dict, Optional, Tuple
+
+from kirara_ai.config import DATA_PATH_P
+from kirara_ai.internal import set_timezone, shutdown_event
 from kirara_ai.ioc.container import DependencyContainer
-from kirara_ai.llm.llm_manager import LLMManager
-from kirara_ai.llm.llm_registry import LLMBackendRegistry
 from kirara_ai.logger import get_logger
-from kirara_ai.mcp_module.manager import MCPServerManager
-from kirara_ai.media import MediaManager
-from kirara_ai.media.carrier import MediaCarrierRegistry, MediaCarrierService
-from kirara_ai.memory.composes import DefaultMemoryComposer, DefaultMemoryDecomposer, MultiElementDecomposer
-from kirara_ai.memory.memory_manager import MemoryManager
-from kirara_ai.memory.scopes import GlobalScope, GroupScope, MemberScope
-from kirara_ai.plugin_manager.plugin_loader import PluginLoader
-from kirara_ai.tracing import LLMTracer, TracingManager
-from kirara_ai.web.api.system.utils import get_installed_version, get_latest_pypi_version
-from kirara_ai.web.app import WebServer
-from kirara_ai.workflow.core.block import BlockRegistry
-from kirara_ai.workflow.core.dispatch import DispatchRuleRegistry, WorkflowDispatcher
-from kirara_ai.workflow.core.workflow import WorkflowRegistry
-from kirara_ai.workflow.implementations.blocks import register_system_blocks
-from kirara_ai.workflow.implementations.workflows import register_system_workflows
+
+# 各子系统（Web 服务、MCP、工作流、追踪等）导入开销较大，在用到它们的函数内再导入
 
 logger = get_logger("Entrypoint")
 
-_interrupt_count = 0  # 添加计数器
+# 中断信号计数器，next() 是单次原子操作，连续收到信号时也不会漏计
+_interrupt_counter = count(1)
+
+# 启动时的更新检查结果缓存 6 小时
+PYPI_CACHE_FILE = str(DATA_PATH_P / ".pypi_cache.json")
+PYPI_CACHE_TTL = 6 * 60 * 60
+
+def _parse_semver(value: str) -> Optional[Tuple[int, int, int]]:
+    """解析形如 X.Y.Z 的版本号，包含预发布等其他标记时返回 None"""
+    parts = value.split(".")
+    if len(parts) != 3 or not all(part.isdigit() for part in parts):
+        return None
+    major, minor, patch = map(int, parts)
+    return major, minor, patch
+
+
+def _is_newer_version(latest: str, current: str) -> bool:
+    """判断 latest 是否比 current 更新"""
+    latest_semver, current_semver = _parse_semver(latest), _parse_semver(current)
+    if latest_semver is not None and current_semver is not None:
+        return latest_semver > current_semver
+
+    from packaging import version
+
+    return version.parse(latest) > version.parse(current)
+
 
 async def check_update():
     """检查更新"""
-    running_version = get_installed_version()
-    logger.info("Checking for updates...")
-    latest_version, _ = await get_latest_pypi_version("kirara-ai")
-    logger.info(f"Running version: {running_version}, Latest version: {latest_version}")
-    backend_update_available = version.parse(latest_version) > version.parse(running_version)
-    if backend_update_available:
-        logger.warning(f"New version {latest_version} is available. Please update to the latest version.")
-        logger.warning(f"You can download the latest version from WebUI")
+    from kirara_ai.web.api.system.utils import get_installed_version, get_latest_pypi_version_cached
+
+    try:
+        running_version = get_installed_version()
+        logger.info("Checking for updates...")
+        latest_version, _ = await get_latest_pypi_version_cached("kirara-ai", PYPI_CACHE_FILE, PYPI_CACHE_TTL)
+        logger.info(f"Running version: {running_version}, Latest version: {latest_version}")
+        if _is_newer_version(latest_version, running_version):
+            logger.warning(f"New version {latest_version} is available. Please update to the latest version.")
+            logger.warning("You can download the latest version from WebUI")
+    except Exception as e:
+        logger.warning(f"Failed to check for updates: {e}")
 
 # 注册信号处理函数
 def _signal_handler(*args):
-    global _interrupt_count
-    _interrupt_count += 1
+    interrupt_count = next(_interrupt_counter)
 
-    if _interrupt_count == 1:
+    if interrupt_count == 1:
         if not shutdown_event.is_set():
             logger.warning("Interrupt signal received. Stopping application...")
             shutdown_event.set()
-    elif _interrupt_count == 2:
+    elif interrupt_count == 2:
         logger.warning("Interrupt signal received again. Press Ctrl+C one more time to force shutdown...")
     else:
         logger.warning("Interrupt signal received for the third time. Forcing shutdown...")
         os._exit(1)
 
 
+def _handle_first_signal(loop: asyncio.AbstractEventLoop, signals: Tuple[signal.Signals, ...]):
+    """
+    事件循环收到第一次中断信号时调用。
+    之后的信号改由普通的信号处理函数接收：事件循环阻塞或已经停止（例如正在同步执行插件的 on_stop）时，
+    再次中断仍能提示并强制退出。
+    """
+    for sig in signals:
+        loop.remove_signal_handler(sig)
+        signal.signal(sig, _signal_handler)
+    _signal_handler()
+
+
 def init_container() -> DependencyContainer:
     container = DependencyContainer()
     container.register(DependencyContainer, container)
@@ -72,6 +91,10 @@ def init_container() -> DependencyContainer:
 
 def init_memory_system(container: DependencyContainer):
     """初始化记忆系统"""
+    from kirara_ai.memory.composes import DefaultMemoryComposer, DefaultMemoryDecomposer, MultiElementDecomposer
+    from kirara_ai.memory.memory_manager import MemoryManager
+    from kirara_ai.memory.scopes import GlobalScope, GroupScope, MemberScope
+
     memory_manager = MemoryManager(container)
 
     # 注册默认作用域
@@ -89,12 +112,17 @@ def init_memory_system(container: DependencyContainer):
 
 def init_media_carrier(container: DependencyContainer):
     """初始化媒体载体"""
+    from kirara_ai.media.carrier import MediaCarrierRegistry
+    from kirara_ai.memory.memory_manager import MemoryManager
+
     # 注册记忆管理器作为媒体引用提供者
     carrier_registry = container.resolve(MediaCarrierRegistry)
     carrier_registry.register("memory", container.resolve(MemoryManager))
 
 def init_tracing_system(container: DependencyContainer):
     """初始化追踪系统"""
+    from kirara_ai.tracing import LLMTracer, TracingManager
+
     logger.info("Initializing tracing system...")
 
     # 初始化追踪管理器
@@ -112,8 +140,51 @@ def init_tracing_system(container: DependencyContainer):
     logger.info("Tracing system initialized")
     return tracing_manager
 
+def _install_event_loop_policy():
+    """安装了 uvloop 时使用它作为事件循环实现"""
+    try:
+        import uvloop
+    except ImportError:
+        return
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.debug("Using uvloop event loop")
+
+
 def init_application() -> DependencyContainer:
     """初始化应用程序"""
+    _install_event_loop_policy()
+    loop = asyncio.new_event_loop()
+    container = loop.run_until_complete(init_application_async(loop))
+    # 插件的 on_load 可能调用 loop.run_until_complete 或 asyncio.run，
+    # 因此插件及之后的加载步骤在事件循环之外、于主线程中执行
+    load_plugins_and_resources(container)
+    return container
+
+
+async def init_application_async(loop: asyncio.AbstractEventLoop) -> DependencyContainer:
+    """
+    异步初始化应用程序。
+    相互独立的阻塞步骤会放到线程池中并发执行，启动耗时取决于最慢的分支而不是所有步骤之和。
+    """
+    from kirara_ai.config.config_loader import ConfigLoader
+    from kirara_ai.config.global_config import GlobalConfig
+    from kirara_ai.database import DatabaseManager
+    from kirara_ai.events.event_bus import EventBus
+    from kirara_ai.im.im_registry import IMRegistry
+    from kirara_ai.im.manager import IMManager
+    from kirara_ai.llm.llm_manager import LLMManager
+    from kirara_ai.llm.llm_registry import LLMBackendRegistry
+    from kirara_ai.mcp_module.manager import MCPServerManager
+    from kirara_ai.media import MediaManager
+    from kirara_ai.media.carrier import MediaCarrierRegistry, MediaCarrierService
+    from kirara_ai.net import get_shared_session
+    from kirara_ai.plugin_manager.plugin_loader import PluginLoader
+    from kirara_ai.web.app import WebServer
+    from kirara_ai.workflow.core.block import BlockRegistry
+    from kirara_ai.workflow.core.dispatch import DispatchRuleRegistry, WorkflowDispatcher
+    from kirara_ai.workflow.core.workflow import WorkflowRegistry
+    from kirara_ai.workflow.implementations.blocks import register_system_blocks
+
     logger.info("Initializing application...")
 
     # 配置文件路径
@@ -122,8 +193,7 @@ def init_application() -> DependencyContainer:
     # 加载配置文件
     logger.info(f"Loading configuration from {config_path}")
     # check data directory
-    if not os.path.exists("./data"):
-        os.makedirs("./data")
+    os.makedirs("./data", exist_ok=True)
     if os.path.exists(config_path):
         config: GlobalConfig = ConfigLoader.load_config(config_path, GlobalConfig)
         logger.info("Configuration loaded successfully")
@@ -137,20 +207,21 @@ def init_application() -> DependencyContainer:
         config = GlobalConfig()
 
     # 设置时区
-    os.environ["TZ"] = config.system.timezone
-    if hasattr(time, "tzset"):
-        time.tzset()
+    set_timezone(config.system.timezone)
 
     container = init_container()
-    container.register(asyncio.AbstractEventLoop, asyncio.new_event_loop())
+    container.register(asyncio.AbstractEventLoop, loop)
+    # 共享 HTTP 会话绑定在应用主循环上，供更新检查、媒体下载等复用连接
+    get_shared_session()
+    # 尽早发起更新检查，让网络等待与后续初始化重叠
+    container.register("update_check_task", loop.create_task(check_update()))
     container.register(EventBus, EventBus())
 
     container.register(GlobalConfig, config)
     container.register(BlockRegistry, BlockRegistry())
 
-    # 初始化数据库管理器
+    # 注册数据库管理器，迁移在下方与插件发现并发执行
     db = DatabaseManager(container)
-    db.initialize()
     container.register(DatabaseManager, db)
 
     # 注册媒体管理器
@@ -192,42 +263,119 @@ def init_application() -> DependencyContainer:
 
     init_media_carrier(container)
 
-    # 初始化追踪系统
-    init_tracing_system(container)
-
     # 注册系统 blocks
     register_system_blocks(container.resolve(BlockRegistry))
 
-    # 发现并加载插件
-    plugin_loader = container.resolve(PluginLoader)
-    logger.info("Discovering internal plugins...")
-    plugin_loader.discover_internal_plugins()
-    logger.info("Discovering external plugins...")
-    plugin_loader.discover_external_plugins()
-    logger.info("Loading plugins")
-    plugin_loader.load_plugins()
-
-    # 加载工作流和调度规则
-    workflow_registry = container.resolve(WorkflowRegistry)
-    workflow_registry.load_workflows()
-    register_system_workflows(workflow_registry)
-    dispatch_registry = container.resolve(DispatchRuleRegistry)
-    dispatch_registry.load_rules()
-
-    # 加载模型
-    llm_manager = container.resolve(LLMManager)
-    logger.info("Loading LLMs")
-    llm_manager.load_config()
-    
-    # 加载MCP服务器
-    mcp_manager = container.resolve(MCPServerManager)
-    logger.info("Loading MCP servers")
-    mcp_manager.load_servers()
+    # 数据库迁移与插件发现互不依赖，并发执行
+    def discover_plugins():
+        logger.info("Discovering internal plugins...")
+        plugin_loader.discover_internal_plugins()
+        logger.info("Discovering external plugins...")
+        plugin_loader.discover_external_plugins()
+
+    await asyncio.gather(
+        asyncio.to_thread(db.initialize),
+        asyncio.to_thread(discover_plugins),
+    )
+
+    # 初始化追踪系统，追踪器启动时需要读取数据库
+    init_tracing_system(container)
 
     return container
 
+
+def load_plugins_and_resources(container: DependencyContainer):
+    """加载插件，以及依赖插件注册内容的工作流、调度规则、模型和 MCP 服务器"""
+    from kirara_ai.llm.llm_manager import LLMManager
+    from kirara_ai.mcp_module.manager import MCPServerManager
+    from kirara_ai.plugin_manager.plugin_loader import PluginLoader
+    from kirara_ai.workflow.core.dispatch import DispatchRuleRegistry
+    from kirara_ai.workflow.core.workflow import WorkflowRegistry
+    from kirara_ai.workflow.implementations.workflows import register_system_workflows
+
+    logger.info("Loading plugins")
+    container.resolve(PluginLoader).load_plugins()
+
+    def load_workflows_and_rules():
+        workflow_registry = container.resolve(WorkflowRegistry)
+        workflow_registry.load_workflows()
+        register_system_workflows(workflow_registry)
+        container.resolve(DispatchRuleRegistry).load_rules()
+
+    # 工作流和调度规则只读取文件、不发布事件，放到工作线程中与下面的加载重叠执行；
+    # 模型和 MCP 服务器加载时会发布事件，保留在主线程
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        workflows_future = executor.submit(load_workflows_and_rules)
+
+        logger.info("Loading LLMs")
+        container.resolve(LLMManager).load_config()
+
+        logger.info("Loading MCP servers")
+        container.resolve(MCPServerManager).load_servers()
+
+        workflows_future.result()
+
+async def _run_shutdown_steps(steps: Dict[str, Awaitable]):
+    """并发执行一组互不依赖的关闭步骤，单个步骤出错不影响其他步骤"""
+    results = await asyncio.gather(*steps.values(), return_exceptions=True)
+    for name, result in zip(steps, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error shutting down {name}: {result}")
+
+
+async def shutdown_services(container: DependencyContainer):
+    """
+    按依赖顺序分阶段关闭各个子系统，同一阶段内互不依赖的步骤并发执行。
+    适配器和 MCP 连接在停止过程中仍可能产生追踪、写入记忆或使用 HTTP 会话，因此最先关闭；
+    追踪记录写入数据库，需要在数据库关闭前完成；共享 HTTP 会话最后关闭。
+    """
+    from kirara_ai.database import DatabaseManager
+    from kirara_ai.im.manager import IMManager
+    from kirara_ai.mcp_module.manager import MCPServerManager
+    from kirara_ai.media import MediaManager
+    from kirara_ai.memory.memory_manager import MemoryManager
+    from kirara_ai.net import close_shared_session
+    from kirara_ai.tracing import TracingManager
+
+    await _run_shutdown_steps({
+        "adapters": container.resolve(IMManager).stop_adapters_async(),
+        "MCP servers": container.resolve(MCPServerManager).disconnect_all_servers_async(),
+    })
+
+    # 追踪器关闭时会向 WebSocket 队列投递消息，asyncio.Queue 只能在事件循环线程中操作
+    try:
+        logger.info("Shutting down tracing system...")
+        container.resolve(TracingManager).shutdown()
+    except Exception as e:
+        logger.error(f"Error shutting down tracing system: {e}")
+
+    def shutdown_memory():
+        logger.info("Shutting down memory system...")
+        container.resolve(MemoryManager).shutdown()
+
+    await _run_shutdown_steps({
+        "memory system": asyncio.to_thread(shutdown_memory),
+        "media metadata": asyncio.to_thread(container.resolve(MediaManager).flush_metadata),
+    })
+
+    try:
+        logger.info("Shutting down database...")
+        container.resolve(DatabaseManager).shutdown()
+    except Exception as e:
+        logger.error(f"Error shutting down database: {e}")
+
+    await _run_shutdown_steps({"HTTP session": close_shared_session()})
+
+
 def run_application(container: DependencyContainer):
     """运行应用程序"""
+    from kirara_ai.events.application import ApplicationStarted, ApplicationStopping
+    from kirara_ai.events.event_bus import EventBus
+    from kirara_ai.im.manager import IMManager
+    from kirara_ai.mcp_module.manager import MCPServerManager
+    from kirara_ai.plugin_manager.plugin_loader import PluginLoader
+    from kirara_ai.web.app import WebServer
+
     loop = container.resolve(asyncio.AbstractEventLoop)
 
     # 启动Web服务器
@@ -249,11 +397,14 @@ def run_application(container: DependencyContainer):
     logger.info("Connecting to MCP servers")
     mcp_manager.connect_all_servers(loop=loop)
 
-    # 注册信号处理函数
-    signal.signal(signal.SIGINT, _signal_handler)
-    signal.signal(signal.SIGTERM, _signal_handler)
-    # 阻止信号处理函数被覆盖
-    signal.signal = lambda *args: None
+    # 注册信号处理函数，第一次中断的回调在事件循环线程中执行
+    shutdown_signals = (signal.SIGINT, signal.SIGTERM)
+    for sig in shutdown_signals:
+        try:
+            loop.add_signal_handler(sig, _handle_first_signal, loop, shutdown_signals)
+        except NotImplementedError:
+            # Windows 的事件循环不支持 add_signal_handler
+            signal.signal(sig, _signal_handler)
 
     try:
         logger.success("Kirara AI 启动完毕，等待消息中...")
@@ -261,43 +412,24 @@ def run_application(container: DependencyContainer):
             f"WebUI 管理平台本地访问地址：http://127.0.0.1:{web_server.listen_port}/"
         )
         logger.success("Application started. Waiting for events...")
-        loop.create_task(check_update())
         event_bus = container.resolve(EventBus)
         event_bus.post(ApplicationStarted())
         loop.run_until_complete(shutdown_event.wait())
     finally:
         event_bus.post(ApplicationStopping())
-        # 关闭记忆系统
-        memory_manager = container.resolve(MemoryManager)
-        logger.info("Shutting down memory system...")
-        memory_manager.shutdown()
 
-        # 关闭追踪系统
-        try:
-            tracing_manager = container.resolve(TracingManager)
-            logger.info("Shutting down tracing system...")
-            tracing_manager.shutdown()
-
-            db_manager = container.resolve(DatabaseManager)
-            logger.info("Shutting down database...")
-            db_manager.shutdown()
-        except Exception as e:
-            logger.error(f"Error shutting down tracing system: {e}")
-
-        # 停止Web服务器
+        # 先停止Web服务器，不再接收新的请求
         logger.info("Stopping web server...")
-
-        # 停止Web服务器
         loop.run_until_complete(web_server.stop())
         logger.info("Web server terminated.")
+
+        loop.run_until_complete(shutdown_services(container))
+
         try:
-            # 停止所有 adapter
-            im_manager.stop_adapters(loop=loop)
-            mcp_manager.disconnect_all_servers(loop=loop)
-            # 停止插件
+            # 插件的 on_stop 会在事件循环上同步执行任务，需要在循环空闲时依次调用
             plugin_loader.stop_plugins()
         except Exception as e:
-            logger.error(f"Error stopping adapters: {e}")
+            logger.error(f"Error stopping plugins: {e}")
 
         # 关闭事件循环
         loop.stop()
@@ -1,8 +1,11 @@
-from kirara_ai.llm.adapter import LLMBackendAdapter
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from kirara_ai.llm.adapter import LLMBackendAdapter
 
 
 class LLMAdapterEvent:
-    def __init__(self, adapter: LLMBackendAdapter, backend_name: str):
+    def __init__(self, adapter: "LLMBackendAdapter", backend_name: str):
         self.adapter = adapter
         self.backend_name = backend_name
         
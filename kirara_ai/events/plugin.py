@@ -1,9 +1,12 @@
 
-from kirara_ai.plugin_manager.plugin import Plugin
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from kirara_ai.plugin_manager.plugin import Plugin
 
 
 class PluginEvent:
-    def __init__(self, plugin: Plugin):
+    def __init__(self, plugin: "Plugin"):
         self.plugin = plugin
         
     def __repr__(self):
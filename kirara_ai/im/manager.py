@@ -131,8 +131,19 @@ class IMManager:
         if loop is None:
             loop = asyncio.get_event_loop()
 
-        for key, adapter in self.adapters.items():
-            loop.run_until_complete(self._stop_adapter(key, adapter))
+        loop.run_until_complete(self.stop_adapters_async())
+
+    async def stop_adapters_async(self):
+        """
+        并发停止所有已启动的 adapter。
+        """
+        keys = list(self.adapters.keys())
+        results = await asyncio.gather(
+            *(self._stop_adapter(key, self.adapters[key]) for key in keys), return_exceptions=True
+        )
+        for key, result in zip(keys, results):
+            if isinstance(result, Exception):
+                logger.opt(exception=result).error(f"Failed to stop adapter {key}: {result}")
 
     def get_adapters(self) -> Dict[str, IMAdapter]:
         """
@@ -1,9 +1,12 @@
+import asyncio
+import threading
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Callable, Coroutine, Dict, List, Literal, Optional, Tuple, Type
 
 from kirara_ai.im.sender import ChatSender
 from kirara_ai.media import MediaManager, MediaType
+from kirara_ai.media.metadata import MediaMetadata
 
 MIMETYPE_MAPPING = {
     "image": MediaType.IMAGE,
@@ -12,8 +15,46 @@ MIMETYPE_MAPPING = {
     "file": MediaType.FILE,
 }
 
+def _get_media_manager() -> MediaManager:
+    """
+    获取全局的媒体管理器。
+    MediaManager 是单例，但每次调用 MediaManager() 都会重新执行 __init__（创建目录并重新加载全部元数据），
+    因此已有实例时直接复用。
+    """
+    return getattr(MediaManager, "_instance", None) or MediaManager()
+
+
+def _run_blocking(coro_factory: Callable[[], Coroutine[Any, Any, None]]) -> None:
+    """
+    在新线程的事件循环中执行协程并阻塞等待完成。
+    构造消息时可能已处于运行中的事件循环内，无法直接 asyncio.run，因此放到新线程中执行。
+    """
+    # 用于存储线程中的异常
+    thread_exception: Optional[Exception] = None
+
+    def run_in_new_loop():
+        nonlocal thread_exception
+        try:
+            asyncio.run(coro_factory())
+        except Exception as e:
+            thread_exception = e
+
+    # 在新线程中运行异步函数
+    thread = threading.Thread(
+        target=run_in_new_loop,
+    )
+    thread.start()
+    thread.join()  # 阻塞等待完成
+
+    # 如果线程中发生异常，则在当前线程中重新抛出
+    if thread_exception:
+        raise thread_exception
+
+
 # 定义消息元素的基类
 class MessageElement(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def to_dict(self):
         pass
@@ -25,6 +66,8 @@ class MessageElement(ABC):
 
 # 定义文本消息元素
 class TextMessage(MessageElement):
+    __slots__ = ("text",)
+
     def __init__(self, text: str):
         self.text = text
 
@@ -58,7 +101,29 @@ class MediaMessage(MessageElement):
         tags: Optional[List[str]] = None,
         media_manager: Optional[MediaManager] = None,
     ):
+        self._setup(url, path, data, format, reference_id, source, description, tags, media_manager)
+        if media_id:
+            self.media_id = media_id
+            return
+
+        # 注册媒体文件
+        _run_blocking(self._register_media)
+
+    def _setup(
+        self,
+        url: Optional[str],
+        path: Optional[str],
+        data: Optional[bytes],
+        format: Optional[str],
+        reference_id: Optional[str],
+        source: Optional[str],
+        description: Optional[str],
+        tags: Optional[List[str]],
+        media_manager: Optional[MediaManager],
+    ) -> None:
+        """初始化除媒体ID以外的字段"""
         self.url = url
+        self._path_verified = False
         self.path = path
         self.data = data
         self.format = format
@@ -66,58 +131,94 @@ class MediaMessage(MessageElement):
         self._source = source
         self._description = description
         self._tags = tags or []
-        self._media_manager = media_manager or MediaManager()
+        self._media_manager = media_manager or _get_media_manager()
         self.base64_url: Optional[str] = None
-        if media_id:
-            self.media_id = media_id
-            return
 
-        # 注册媒体文件
-
-        # 使用线程创建新的事件循环来阻塞执行媒体注册
-        import asyncio
-        import threading
-
-        # 用于存储线程中的异常
-        thread_exception: Optional[Exception] = None
+    @classmethod
+    def create_many(cls, items: List[Tuple[Type["MediaMessage"], Dict[str, Any]]]) -> List["MediaMessage"]:
+        """
+        一次构造多个媒体消息，需要注册的媒体通过 MediaManager.register_media_batch 一起注册，
+        只需启动一次注册线程。
+
+        Args:
+            items: (媒体消息类型, 构造参数) 列表，构造参数与 __init__ 相同
+
+        Returns:
+            List[MediaMessage]: 与 items 顺序一致的媒体消息列表
+        """
+        elements: List[MediaMessage] = []
+        pending: Dict[int, Tuple[MediaManager, List[MediaMessage]]] = {}
+        for element_type, kwargs in items:
+            kwargs = dict(kwargs)
+            media_id = kwargs.pop("media_id", None)
+            element = element_type.__new__(element_type)
+            element._setup(
+                kwargs.pop("url", None),
+                kwargs.pop("path", None),
+                kwargs.pop("data", None),
+                kwargs.pop("format", None),
+                kwargs.pop("reference_id", None),
+                kwargs.pop("source", "im_message"),
+                kwargs.pop("description", None),
+                kwargs.pop("tags", None),
+                kwargs.pop("media_manager", None),
+            )
+            if kwargs:
+                raise TypeError(f"Unexpected arguments for {element_type.__name__}: {', '.join(kwargs)}")
+            if media_id:
+                element.media_id = media_id
+            else:
+                manager = element._media_manager
+                pending.setdefault(id(manager), (manager, []))[1].append(element)
+            elements.append(element)
+
+        async def register_all() -> None:
+            for manager, group in pending.values():
+                results = await manager.register_media_batch([e._registration_spec() for e in group])
+                for element, (media_id, metadata) in zip(group, results):
+                    element._apply_metadata(media_id, metadata)
+
+        if pending:
+            _run_blocking(register_all)
+        return elements
 
-        def run_in_new_loop():
-            nonlocal thread_exception
-            try:
-                asyncio.run(self._register_media())
-            except Exception as e:
-                thread_exception = e
-
-        # 在新线程中运行异步注册函数
-        thread = threading.Thread(
-            target=run_in_new_loop,
-        )
-        thread.start()
-        thread.join()  # 阻塞等待完成
+    @property
+    def path(self) -> Optional[str]:
+        return self._path
 
-        # 如果线程中发生异常，则在主线程中重新抛出
-        if thread_exception:
-            raise thread_exception
+    @path.setter
+    def path(self, value: Optional[str]) -> None:
+        self._path = value
+        # 路径变更后需要重新确认文件是否存在
+        self._path_verified = False
 
     async def _register_media(self) -> None:
         """注册媒体文件"""
         media_manager = self._media_manager
 
         # 根据传入的参数注册媒体文件
-        self.media_id = await media_manager.register_media(
-            url=self.url,
-            path=self.path,
-            data=self.data,
-            format=self.format,
-            source=self._source,
-            description=self._description,
-            tags=self._tags,
-            media_type=MIMETYPE_MAPPING[self.resource_type],
-            reference_id=self._reference_id
-        )
+        media_id = await media_manager.register_media(**self._registration_spec())
 
         # 获取媒体元数据
-        metadata = media_manager.get_metadata(self.media_id)
+        self._apply_metadata(media_id, media_manager.get_metadata(media_id))
+
+    def _registration_spec(self) -> Dict[str, Any]:
+        """构造 register_media 的关键字参数"""
+        return {
+            "url": self.url,
+            "path": self.path,
+            "data": self.data,
+            "format": self.format,
+            "source": self._source,
+            "description": self._description,
+            "tags": self._tags,
+            "media_type": MIMETYPE_MAPPING[self.resource_type],
+            "reference_id": self._reference_id,
+        }
+
+    def _apply_metadata(self, media_id: str, metadata: Optional[MediaMetadata]) -> None:
+        """记录注册结果，并以元数据中检测到的格式和类型为准"""
+        self.media_id = media_id
         if metadata and metadata.format:
             self.format = metadata.format
             if metadata.media_type:
@@ -146,8 +247,9 @@ class MediaMessage(MessageElement):
         if not self.media_id:
             raise ValueError("Media not registered")
 
-        # 如果已经有路径，直接返回
-        if self.path and Path(self.path).exists():
+        # 如果已经有路径，直接返回；文件是否存在只在路径设置后检查一次
+        if self.path and (self._path_verified or Path(self.path).exists()):
+            self._path_verified = True
             return self.path
 
         # 否则从媒体管理器获取
@@ -155,6 +257,8 @@ class MediaMessage(MessageElement):
         file_path = await media_manager.get_file_path(self.media_id)
         if file_path:
             self.path = str(file_path)  # 缓存结果
+            # 媒体管理器返回的路径已确认存在
+            self._path_verified = True
             return self.path
 
         raise ValueError("Failed to get media file path")
@@ -203,8 +307,12 @@ class MediaMessage(MessageElement):
 
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
-        result = {
-            "type": self.resource_type,
+        return self._base_dict(self.resource_type)
+
+    def _base_dict(self, type_name: str) -> Dict[str, Any]:
+        """构造媒体消息的字典表示，子类直接指定 type 字段"""
+        result: Dict[str, Any] = {
+            "type": type_name,
             "media_id": self.media_id,
         }
 
@@ -224,9 +332,7 @@ class VoiceMessage(MediaMessage):
     resource_type = "audio"
 
     def to_dict(self):
-        result = super().to_dict()
-        result["type"] = "voice"
-        return result
+        return self._base_dict("voice")
 
     def to_plain(self):
         return "[VoiceMessage]"
@@ -237,9 +343,7 @@ class ImageMessage(MediaMessage):
     resource_type = "image"
 
     def to_dict(self):
-        result = super().to_dict()
-        result["type"] = "image"
-        return result
+        return self._base_dict("image")
 
     def to_plain(self):
         return f"[ImageMessage:media_id={self.media_id},url={self.url},alt={self.get_description()}]"
@@ -250,6 +354,8 @@ class ImageMessage(MediaMessage):
 # 定义@消息元素
 # :deprecated
 class AtElement(MessageElement):
+    __slots__ = ("user_id", "nickname")
+
     def __init__(self, user_id: str, nickname: str = ""):
         self.user_id = user_id
         self.nickname = nickname
@@ -265,6 +371,8 @@ class AtElement(MessageElement):
 
 # 定义@消息元素
 class MentionElement(MessageElement):
+    __slots__ = ("target",)
+
     def __init__(self, target: ChatSender):
         self.target = target
 
@@ -279,6 +387,7 @@ class MentionElement(MessageElement):
 
 # 定义回复消息元素
 class ReplyElement(MessageElement):
+    __slots__ = ("message_id",)
 
     def __init__(self, message_id: str):
         self.message_id = message_id
@@ -299,9 +408,7 @@ class FileMessage(MediaMessage):
     resource_type = "file"
 
     def to_dict(self):
-        result = super().to_dict()
-        result["type"] = "file"
-        return result
+        return self._base_dict("file")
 
     def to_plain(self):
         return f"[File:{self.path or self.url or 'unnamed'}]"
@@ -312,6 +419,7 @@ class FileMessage(MediaMessage):
 
 # 定义JSON消息元素
 class JsonMessage(MessageElement):
+    __slots__ = ("data",)
 
     def __init__(self, data: str):
         self.data = data
@@ -328,6 +436,7 @@ class JsonMessage(MessageElement):
 
 # 定义表情消息元素
 class EmojiMessage(MessageElement):
+    __slots__ = ("face_id",)
 
     def __init__(self, face_id: str):
         self.face_id = face_id
@@ -348,9 +457,7 @@ class VideoMessage(MediaMessage):
     resource_type = "video"
 
     def to_dict(self):
-        result = super().to_dict()
-        result["type"] = "video"
-        return result
+        return self._base_dict("video")
 
     def to_plain(self):
         return f"[Video:{self.path or self.url or 'unnamed'}]"
@@ -374,40 +481,68 @@ class IMMessage:
         voices: 消息中的语音列表
     """
 
+    __slots__ = ("sender", "message_elements", "raw_message", "_index_cache", "_indexed_elements", "_indexed_length")
+
     sender: ChatSender
     message_elements: List[MessageElement]
     raw_message: Optional[dict]
+    # content / images / voices 的缓存，以及计算缓存时对应的消息元素列表和长度
+    _index_cache: Optional[Tuple[str, List[ImageMessage], List[VoiceMessage]]]
+    _indexed_elements: Optional[List[MessageElement]]
+    _indexed_length: int
 
     def __repr__(self):
         return f"IMMessage(sender={self.sender}, message_elements={self.message_elements}, raw_message={self.raw_message})"
 
+    def _index(self) -> Tuple[str, List[ImageMessage], List[VoiceMessage]]:
+        """
+        一次遍历消息元素，同时得到纯文本内容、图片列表和语音列表。
+        结果会被缓存，直到 message_elements 被替换或增删元素。
+        """
+        elements = self.message_elements
+        if (
+            self._index_cache is not None
+            and self._indexed_elements is elements
+            and self._indexed_length == len(elements)
+        ):
+            return self._index_cache
+
+        content = ""
+        images: List[ImageMessage] = []
+        voices: List[VoiceMessage] = []
+        texts = [element.text for element in elements if type(element) is TextMessage]
+        if len(texts) == len(elements):
+            # 大多数消息只包含文本，直接拼接，无需逐个元素分派
+            content = "\n".join(texts)
+        else:
+            for element in elements:
+                content += element.to_plain()
+                if isinstance(element, TextMessage):
+                    content += "\n"
+                elif isinstance(element, ImageMessage):
+                    images.append(element)
+                elif isinstance(element, VoiceMessage):
+                    voices.append(element)
+
+        self._index_cache = (content.strip(), images, voices)
+        self._indexed_elements = elements
+        self._indexed_length = len(elements)
+        return self._index_cache
+
     @property
     def content(self) -> str:
         """获取消息的纯文本内容"""
-        content = ""
-        for element in self.message_elements:
-            content += element.to_plain()
-            if isinstance(element, TextMessage):
-                content += "\n"
-        return content.strip()
+        return self._index()[0]
 
     @property
     def images(self) -> List[ImageMessage]:
         """获取消息中的所有图片"""
-        return [
-            element
-            for element in self.message_elements
-            if isinstance(element, ImageMessage)
-        ]
+        return self._index()[1]
 
     @property
     def voices(self) -> List[VoiceMessage]:
         """获取消息中的所有语音"""
-        return [
-            element
-            for element in self.message_elements
-            if isinstance(element, VoiceMessage)
-        ]
+        return self._index()[2]
 
     def __init__(
         self,
@@ -418,16 +553,23 @@ class IMMessage:
         self.sender = sender
         self.message_elements = message_elements
         self.raw_message = raw_message
+        self._index_cache = None
+        self._indexed_elements = None
+        self._indexed_length = 0
 
     def to_dict(self):
+        # 一次遍历同时生成元素字典和纯文本
+        element_dicts = []
+        plain_texts = []
+        append_dict = element_dicts.append
+        append_plain = plain_texts.append
+        for element in self.message_elements:
+            append_dict(element.to_dict())
+            append_plain(element.to_plain())
         return {
             "sender": self.sender,
-            "message_elements": [
-                element.to_dict() for element in self.message_elements
-            ],
-            "plain_text": "".join(
-                [element.to_plain() for element in self.message_elements]
-            ),
+            "message_elements": element_dicts,
+            "plain_text": "".join(plain_texts),
             "raw_message": self.raw_message,
         }
 
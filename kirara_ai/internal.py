@@ -1,5 +1,8 @@
 # 定义优雅退出异常
 import asyncio
+import os
+import time
+from functools import lru_cache
 
 shutdown_event = asyncio.Event()
 
@@ -17,3 +20,9 @@ def get_and_reset_restart_flag():
     return flag
 
 
+# 只缓存最近一次设置的时区：重复设置相同时区时跳过 tzset，切换到其他时区后再切回来仍会生效
+@lru_cache(maxsize=1)
+def set_timezone(tz: str):
+    os.environ["TZ"] = tz
+    if hasattr(time, "tzset"):
+        time.tzset()
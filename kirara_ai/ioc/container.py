@@ -63,7 +63,10 @@ class DependencyContainer:
                 会根据类型自动查找对应对象实例。
             value: 值/对象实例
         """
-        self.registry[key] = value
+        registry = self.registry
+        # 重复注册同一个对象时跳过写入
+        if key not in registry or registry[key] is not value:
+            registry[key] = value
 
     @overload
     def resolve(self, key: Type[T]) -> T: ...
@@ -74,7 +77,7 @@ class DependencyContainer:
     def resolve(self, key: Type[T] | Any) -> T | Any:
         """
         依照{key}从容器解析出一个值或对象实例。
-        如果{key}在当前容器中不存在，则会递归查找父容器。
+        如果{key}在当前容器中不存在，则会依次查找父容器。
 
         Args:
             key: 对象的标识键, 一般为对象的类 (Type) 如 IMManager, LLMManager等, 
@@ -86,13 +89,13 @@ class DependencyContainer:
         Raises:
             KeyError: {key}在当前容器和父容器中都不存在时抛出
         """
-        if key in self.registry:
-            return self.registry[key]
-
-        elif self.parent:
-            return self.parent.resolve(key)
-        else:
-            raise KeyError(f"Dependency {key} not found.")
+        container = self
+        while container is not None:
+            registry = container.registry
+            if key in registry:
+                return registry[key]
+            container = container.parent
+        raise KeyError(f"Dependency {key} not found.")
 
 
     def has(self, key: Type[T] | Any) -> bool:
@@ -103,7 +106,12 @@ class DependencyContainer:
         Returns:
             成功返回 True, 失败返回 False
         """
-        return key in self.registry or (self.parent is not None and self.parent.has(key))
+        container = self
+        while container is not None:
+            if key in container.registry:
+                return True
+            container = container.parent
+        return False
 
     @overload
     def destroy(self, key: Type[T], recursive: bool = False) -> None: ...
@@ -122,12 +130,15 @@ class DependencyContainer:
         Raises:
             KeyError: {key}在当前容器和父容器中都不存在时抛出
         """
-        if key in self.registry:
-            del self.registry[key]
-        elif self.parent and recursive:
-            self.parent.destroy(key, recursive)
-        else: 
-            raise KeyError(f"Cannot destroy dependency {key} which is not found in registry or parent container's registry.")
+        container = self
+        while container is not None:
+            if key in container.registry:
+                del container.registry[key]
+                return
+            if not recursive:
+                break
+            container = container.parent
+        raise KeyError(f"Cannot destroy dependency {key} which is not found in registry or parent container's registry.")
 
 
     def scoped(self):
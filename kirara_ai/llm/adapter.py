@@ -1,4 +1,3 @@
-from abc import ABC
 from typing import List, Protocol, runtime_checkable
 
 from kirara_ai.config.global_config import ModelConfig
@@ -26,7 +25,12 @@ class LLMEmbeddingProtocol(Protocol):
 class LLMReRankProtocol(Protocol):
     def rerank(self, req: LLMReRankRequest) -> LLMReRankResponse: ...
 
-class LLMBackendAdapter(ABC):
+class LLMBackendAdapter:
+    """
+    LLM 后端适配器的基类，只提供各适配器共享的属性。
+    适配器具备的能力由上方的 Protocol（LLMChatProtocol、LLMEmbeddingProtocol 等）描述，
+    没有抽象方法，因此不需要继承 ABC。
+    """
     backend_name: str
     media_manager: MediaManager
     tracer: LLMTracer
\ No newline at end of file
@@ -0,0 +1,161 @@
+import asyncio
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Tuple
+
+from kirara_ai.llm.format.embedding import LLMEmbeddingRequest, LLMEmbeddingResponse
+
+if TYPE_CHECKING:
+    from kirara_ai.llm.adapter import LLMEmbeddingProtocol
+
+_PendingItem = Tuple[LLMEmbeddingRequest, "asyncio.Future[LLMEmbeddingResponse]"]
+
+
+class AsyncDynamicEmbeddingBatcher:
+    """
+    动态合并并发的 embedding 请求。
+    在很短的等待窗口内收集到的请求，若模型和各项参数都相同，则合并 inputs 后只向后端发送一次请求，
+    再按各请求的输入数量把向量切分回去。适用于大量单条输入的并发请求，例如记忆检索时逐条生成向量。
+
+    合并后的 token 用量无法准确拆分到每个请求，因此被合并的请求返回的 usage 为 None；
+    单独发送的请求原样返回后端的响应。
+
+    同一个实例只能在一个事件循环中使用。
+    """
+
+    def __init__(
+        self,
+        adapter: "LLMEmbeddingProtocol",
+        max_batch_size: int = 32,
+        batch_wait_timeout_s: float = 0.002,
+    ):
+        """
+        Args:
+            adapter: 实际执行 embedding 的适配器
+            max_batch_size: 单次后端请求最多包含的输入数量
+            batch_wait_timeout_s: 收到第一个请求后等待更多请求的时间
+        """
+        self.adapter = adapter
+        self.max_batch_size = max_batch_size
+        self.batch_wait_timeout_s = batch_wait_timeout_s
+        self._queue: Optional[asyncio.Queue[_PendingItem]] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._dispatch_tasks: set[asyncio.Task] = set()
+        # 等待窗口内已从队列取出、尚未发送的请求
+        self._collecting: List[_PendingItem] = []
+
+    async def embed(self, req: LLMEmbeddingRequest) -> LLMEmbeddingResponse:
+        """提交一个 embedding 请求，等待合并后的结果"""
+        if self._queue is None or self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run(self._queue), name="embedding-batcher")
+        future: asyncio.Future[LLMEmbeddingResponse] = asyncio.get_running_loop().create_future()
+        await self._queue.put((req, future))
+        return await future
+
+    async def close(self) -> None:
+        """停止后台任务，尚未完成的请求会被取消"""
+        if self._worker is not None:
+            self._worker.cancel()
+            await asyncio.gather(self._worker, return_exceptions=True)
+            self._worker = None
+        for _, future in self._collecting:
+            future.cancel()
+        self._collecting = []
+        if self._dispatch_tasks:
+            await asyncio.gather(*self._dispatch_tasks, return_exceptions=True)
+        if self._queue is not None:
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                future.cancel()
+            self._queue = None
+
+    @staticmethod
+    def _batch_key(req: LLMEmbeddingRequest) -> Hashable:
+        """只有这些参数都相同的请求才能合并"""
+        return (req.model, req.dimension, req.encoding_format, req.input_type, req.truncate, req.output_type)
+
+    async def _run(self, queue: "asyncio.Queue[_PendingItem]") -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await queue.get()]
+            self._collecting = pending
+            input_count = len(pending[0][0].inputs)
+            deadline = loop.time() + self.batch_wait_timeout_s
+            # 在等待窗口内继续收集请求，直到输入数量达到上限
+            while input_count < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+                pending.append(item)
+                input_count += len(item[0].inputs)
+
+            self._collecting = []
+            for batch in self._split_batches(pending):
+                task = asyncio.create_task(self._dispatch(batch))
+                self._dispatch_tasks.add(task)
+                task.add_done_callback(self._dispatch_tasks.discard)
+
+    def _split_batches(self, pending: List[_PendingItem]) -> List[List[_PendingItem]]:
+        """按合并条件分组，并保证每批的输入数量不超过上限（单个请求超过上限时单独发送）"""
+        groups: Dict[Hashable, List[_PendingItem]] = defaultdict(list)
+        for item in pending:
+            if not item[1].cancelled():
+                groups[self._batch_key(item[0])].append(item)
+
+        batches: List[List[_PendingItem]] = []
+        for items in groups.values():
+            batch: List[_PendingItem] = []
+            batch_size = 0
+            for item in items:
+                size = len(item[0].inputs)
+                if batch and batch_size + size > self.max_batch_size:
+                    batches.append(batch)
+                    batch, batch_size = [], 0
+                batch.append(item)
+                batch_size += size
+            if batch:
+                batches.append(batch)
+        return batches
+
+    async def _dispatch(self, batch: List[_PendingItem]) -> None:
+        """向后端发送一批请求，并把结果分发给各个调用者"""
+        if len(batch) == 1:
+            merged = batch[0][0]
+        else:
+            merged = batch[0][0].model_copy(update={"inputs": [x for req, _ in batch for x in req.inputs]})
+
+        try:
+            # 适配器的 embed 是阻塞调用，放到线程中执行
+            response = await asyncio.to_thread(self.adapter.embed, merged)
+            if len(batch) == 1:
+                results = [response]
+            else:
+                results = self._split_response(batch, response, len(merged.inputs))
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    @staticmethod
+    def _split_response(
+        batch: List[_PendingItem], response: LLMEmbeddingResponse, input_count: int
+    ) -> List[LLMEmbeddingResponse]:
+        """按各请求的输入数量切分合并请求的向量"""
+        if len(response.vectors) != input_count:
+            raise ValueError(f"Embedding backend returned {len(response.vectors)} vectors for {input_count} inputs")
+        results = []
+        offset = 0
+        for req, _ in batch:
+            count = len(req.inputs)
+            results.append(LLMEmbeddingResponse(vectors=response.vectors[offset:offset + count]))
+            offset += count
+        return results
@@ -1,13 +1,31 @@
-from typing import Literal, Optional
-from pydantic import BaseModel
+from enum import Enum
+from typing import Annotated, Optional, Union
+from pydantic import BaseModel, ConfigDict, Field
 
 from .message import LLMChatTextContent, LLMChatImageContent
 from .response import Usage
 
-FormatType = Literal["base64"]
-OutputType = Literal["float", "int8", "uint8", "binary", "ubinary"]
-InputType = Literal["string", "query", "document"]
-InputUnionType = LLMChatTextContent | LLMChatImageContent
+
+# 以下枚举继承 str，既可以直接与字符串比较，也能原样写入请求体；pydantic 校验时按值查表得到枚举成员
+class FormatType(str, Enum):
+    BASE64 = "base64"
+
+
+class OutputType(str, Enum):
+    FLOAT = "float"
+    INT8 = "int8"
+    UINT8 = "uint8"
+    BINARY = "binary"
+    UBINARY = "ubinary"
+
+
+class InputType(str, Enum):
+    STRING = "string"
+    QUERY = "query"
+    DOCUMENT = "document"
+
+# 按 type 字段直接分派到对应的内容模型，不必逐个尝试联合类型中的每个成员
+InputUnionType = Annotated[Union[LLMChatTextContent, LLMChatImageContent], Field(discriminator="type")]
 
 class LLMEmbeddingRequest(BaseModel):
     """
@@ -24,6 +42,9 @@ class LLMEmbeddingRequest(BaseModel):
         truncate (Optional[bool]): 是否自动截断超长文本, 以适应llm上下文长度上限。
         output_type (Optional[OutputType]): 向量内部应该使用哪种数据类型. 一般默认float
     """
+
+    model_config = ConfigDict(defer_build=True)
+
     inputs: list[InputUnionType]
     model: str
     dimension: Optional[int] = None
@@ -40,5 +61,8 @@ class LLMEmbeddingResponse(BaseModel):
         vectors: list[vector]
         usage: Optional[Usage] = None
     """
+
+    model_config = ConfigDict(defer_build=True)
+
     vectors: list[vector]
     usage: Optional[Usage] = None
\ No newline at end of file
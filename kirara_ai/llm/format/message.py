@@ -1,10 +1,9 @@
-import json
-from typing import Literal, Optional, Union
+from typing import Literal, Optional, Union, get_args
 
 from pydantic import BaseModel, field_validator, model_validator
 from typing_extensions import Self
 
-from .tool import LLMToolResultContent
+from .tool import LLMToolResultContent, json_loads
 
 RoleType = Literal["system", "user", "assistant"]
 
@@ -28,16 +27,27 @@ class LLMToolCallContent(BaseModel):
     name: str
     parameters: Optional[dict] = None
 
-    @classmethod
     @field_validator("parameters", mode="before")
+    @classmethod
     def convert_parameters_to_dict(cls, v: Optional[Union[str, dict]]) -> Optional[dict]:
-        if isinstance(v, str):
-            return json.loads(v)
-        return v
+        return json_loads(v) if isinstance(v, str) else v
 
 LLMChatContentPartType = Union[LLMChatTextContent, LLMChatImageContent, LLMToolCallContent, LLMToolResultContent]
+# LLMChatContentPartType 中的各个类型，需要 isinstance 判断时直接使用此元组，不必每次展开 Union
+LLM_CHAT_CONTENT_PART_TYPES: tuple[type, ...] = get_args(LLMChatContentPartType)
 RoleTypes = Literal["user", "assistant", "system", "tool"]
 
+# 各个 role 允许出现在 content 中的内容类型。内容类型都是不会被继承的 pydantic 模型，按确切类型查集合即可
+_NORMAL_CONTENT_TYPES = frozenset({LLMChatTextContent, LLMChatImageContent, LLMToolCallContent})
+_TOOL_CONTENT_TYPES = frozenset({LLMToolResultContent})
+
+def _check_content_types(role: str, content: list) -> None:
+    allowed = _TOOL_CONTENT_TYPES if role == "tool" else _NORMAL_CONTENT_TYPES
+    if not all(type(element) in allowed for element in content):
+        if role == "tool":
+            raise ValueError("content must be a list of LLMToolResultContent, when role is 'tool'")
+        raise ValueError(f"content must be a list of LLMChatContentPartType, when role is {role}")
+
 class LLMChatMessage(BaseModel):
     """
     当 role 为 "tool" 时, content 内部只能为 list[LLMToolResultContent]
@@ -49,11 +59,15 @@ class LLMChatMessage(BaseModel):
     def check_content_type(self) -> Self:
         # 此装饰器将在 model 实例化后执行，`mode = "after"`
         # 用于检查 content 字段的类型是否符合 role 要求
-        match self.role:
-            case "user" | "assistant" | "system":
-                if not all(any(isinstance(element, content_type) for content_type in [LLMChatTextContent, LLMChatImageContent, LLMToolCallContent]) for element in self.content):
-                    raise ValueError(f"content must be a list of LLMChatContentPartType, when role is {self.role}")
-            case "tool":
-                if not all(isinstance(element, LLMToolResultContent) for element in self.content):
-                    raise ValueError("content must be a list of LLMToolResultContent, when role is 'tool'")
-        return self
\ No newline at end of file
+        _check_content_types(self.role, self.content)
+        return self
+
+    @classmethod
+    def build(cls, role: RoleTypes, content: list[LLMChatContentPartType]) -> "LLMChatMessage":
+        """
+        由内部代码使用已经构造好的内容对象创建消息。
+        跳过 pydantic 对每个元素的校验，只检查内容类型是否符合 role 要求。
+        来自外部（如 HTTP 请求）的数据仍应通过构造函数校验。
+        """
+        _check_content_types(role, content)
+        return cls.model_construct(role=role, content=content)
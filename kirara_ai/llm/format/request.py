@@ -1,11 +1,18 @@
-from typing import Any, List, Optional
+from typing import Annotated, Any, List, Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 from kirara_ai.llm.format.message import LLMChatMessage
 from .tool import Tool
 
+# 采样参数使用严格类型，跳过 pydantic 宽松模式下的字符串、浮点数转换尝试（严格模式下 float 字段仍接受 int）
+PenaltyParam = Annotated[Optional[float], Field(strict=True, ge=-2, le=2)]
+TokenCountParam = Annotated[Optional[int], Field(strict=True, ge=1)]
+
+# 请求模型在首次调用大模型时才会用到，pydantic 校验器推迟到首次使用时再构建，缩短启动时间
 class ResponseFormat(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     type: Optional[str] = None
 
 class LLMChatRequest(BaseModel):
@@ -17,21 +24,40 @@ class LLMChatRequest(BaseModel):
             tool_choice这个参数告诉llmMessage应该如何选择调用的工具。
             "
     """
-    
-    messages: List[LLMChatMessage] = []
+
+    model_config = ConfigDict(defer_build=True)
+
+    messages: List[LLMChatMessage] = Field(default_factory=list)
     model: Optional[str] = None
-    frequency_penalty: Optional[int] = None
-    max_tokens: Optional[int] = None
-    presence_penalty: Optional[int] = None
+    frequency_penalty: PenaltyParam = None
+    max_tokens: TokenCountParam = None
+    presence_penalty: PenaltyParam = None
     response_format: Optional[ResponseFormat] = None
     stop: Optional[Any] = None
     stream: Optional[bool] = None
     stream_options: Optional[Any] = None
-    temperature: Optional[int] = None
-    top_p: Optional[int] = None
+    temperature: Annotated[Optional[float], Field(strict=True, ge=0, le=2)] = None
+    top_p: Annotated[Optional[float], Field(strict=True, ge=0, le=1)] = None
     # 规范tool传递
     tools: Optional[list[Tool]] = None 
     # tool_choice各家目前标准不尽相同，暂不向用户提供更改这个值的选项
     tool_choice: Optional[Any] = None
     logprobs: Optional[bool] = None
     top_logprobs: Optional[Any] = None
+
+    @classmethod
+    def validate_messages(cls, raw: Any) -> List[LLMChatMessage]:
+        """校验来自外部（如 HTTP 请求、持久化数据）的消息列表"""
+        return _MESSAGES_ADAPTER.validate_python(raw)
+
+    @classmethod
+    def validate_tools(cls, raw: Any) -> List[Tool]:
+        """校验来自外部的工具列表"""
+        return _TOOLS_ADAPTER.validate_python(raw)
+
+
+# 列表校验器在模块级别只创建一次，避免每次校验都重新编译 pydantic core schema；同样推迟到首次使用时构建
+_MESSAGES_ADAPTER: TypeAdapter[List[LLMChatMessage]] = TypeAdapter(
+    List[LLMChatMessage], config=ConfigDict(defer_build=True)
+)
+_TOOLS_ADAPTER: TypeAdapter[List[Tool]] = TypeAdapter(List[Tool], config=ConfigDict(defer_build=True))
@@ -1,6 +1,6 @@
 from typing import Optional
 from typing_extensions import Self
-from pydantic import BaseModel, model_validator
+from pydantic import BaseModel, ConfigDict, model_validator
 
 from .response import Usage
 
@@ -21,6 +21,9 @@ class LLMReRankRequest(BaseModel):
         sort: 是否按照结果的相似度得分进行排序？ 默认不进行
             Tips: 当return_documents为False时，若sort为True，则抛出异常。
     """
+
+    model_config = ConfigDict(defer_build=True)
+
     query: str
     documents: list[str]
     model: str
@@ -45,6 +48,8 @@ class ReRankerContent(BaseModel):
         score: 文档的相似度分数。
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     document: Optional[str] = None
     score: float
 
@@ -58,6 +63,8 @@ class LLMReRankResponse(BaseModel):
         sort (bool): 是否按照结果的相似度排序？将其设置为字段方便后续接口检查是否经过排序(方便debug)。其应该由request的sort字段赋值。
     """
 
+    model_config = ConfigDict(defer_build=True)
+
     contents: list[ReRankerContent]
     usage: Usage
     sort: bool
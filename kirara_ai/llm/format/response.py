@@ -1,22 +1,53 @@
-from typing import List, Optional
+from typing import List, Optional, get_args
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
-from kirara_ai.llm.format.message import LLMChatMessage
+from kirara_ai.llm.format.message import LLMChatContentPartType, LLMChatMessage, RoleTypes, _check_content_types
 from kirara_ai.llm.format.tool import ToolCall
 
+_ROLES = frozenset(get_args(RoleTypes))
 
+
+# 响应模型只在首次调用大模型时才会用到，推迟到首次使用时再构建 pydantic 校验器，减少启动时的开销
 class Message(LLMChatMessage):
+    model_config = ConfigDict(defer_build=True)
+
     tool_calls: Optional[List[ToolCall]] = None
     finish_reason: Optional[str] = None
 
+    @classmethod
+    def build(
+        cls,
+        role: RoleTypes,
+        content: list[LLMChatContentPartType],
+        tool_calls: Optional[List[ToolCall]] = None,
+        finish_reason: Optional[str] = None,
+    ) -> "Message":
+        """
+        由 Adapter 使用已经构造好的内容对象创建响应消息，跳过 pydantic 对每个元素的校验。
+        role 可能直接取自接口返回值，这里仍会检查其取值。
+        """
+        if role not in _ROLES:
+            raise ValueError(f"Invalid role: {role}")
+        _check_content_types(role, content)
+        return cls.model_construct(role=role, content=content, tool_calls=tool_calls, finish_reason=finish_reason)
+
 class Usage(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     completion_tokens: Optional[int] = None
     prompt_tokens: Optional[int] = None
     total_tokens: Optional[int] = None
     cached_tokens: Optional[int] = None
 
 class LLMChatResponse(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     model: Optional[str] = None
     usage: Optional[Usage] = None
-    message: Message
\ No newline at end of file
+    message: Message
+
+    @classmethod
+    def build(cls, message: Message, model: Optional[str] = None, usage: Optional[Usage] = None) -> "LLMChatResponse":
+        """由 Adapter 使用已经构造好的 Message 和 Usage 创建响应，跳过对嵌套模型的重复校验"""
+        return cls.model_construct(model=model, usage=usage, message=message)
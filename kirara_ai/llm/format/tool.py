@@ -1,7 +1,30 @@
 import json
-from typing import Any, Callable, Coroutine, Generic, List, Literal, Optional, TypeVar, Union
+from functools import lru_cache
+from typing import Any, Callable, Coroutine, Dict, Generic, List, Literal, Optional, TypeVar, Union
 
-from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator
+from pydantic import BaseModel, ConfigDict, Field, ValidationError, field_serializer, field_validator
+
+# 工具调用参数和请求体可能是较大的 JSON，安装了 orjson 时使用它解析和序列化
+try:
+    import orjson
+    from orjson import loads as json_loads
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    from json import loads as json_loads
+
+
+def _json_default(obj: Any) -> Any:
+    # 请求体中可能直接带有 pydantic 模型（如 response_format）
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(exclude_none=True)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def json_dumps(obj: Any) -> bytes:
+    """将请求体序列化为 UTF-8 编码的 JSON，安装了 orjson 时使用它序列化"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=_json_default)
+    return json.dumps(obj, ensure_ascii=False, default=_json_default).encode("utf-8")
 
 class TextContent(BaseModel):
     type: Literal["text"] = "text"
@@ -30,6 +53,8 @@ class LLMToolResultContent(BaseModel):
     isError: bool = False
 
 class Function(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     # 工具名称
     name: str
     # 这个字段类似于 python 的关键字参数，你可以直接使用`**arguments`
@@ -39,9 +64,11 @@ class Function(BaseModel):
     @classmethod
     # pydantic 官网建议将 @classmethod 放在下面。因为python装饰器执行顺序是由下到上。
     def convert_arguments(cls, v: Optional[Union[str, dict]]) -> Optional[dict]:
-        return json.loads(v) if isinstance(v, str) else v
+        return json_loads(v) if isinstance(v, str) else v
 
 class ToolCall(BaseModel):
+    model_config = ConfigDict(defer_build=True)
+
     # call id，对应 LLMToolCallContent 的 id
     id: str
     # type这个字段目前不知道有什么用
@@ -75,11 +102,39 @@ class ToolInputSchema(BaseModel):
         required (list[str]): 必填参数的名称列表
         additionalProperties (Optional[bool]): 是否允许额外的键值对
     """
+
+    # 同一份 schema 会被多个 Tool 共享（见 build_tool_input_schema），因此不允许修改
+    model_config = ConfigDict(defer_build=True, frozen=True)
+
     type: Literal["object"] = "object"
-    properties: dict
+    # 不透明的 JSON Schema 字典，原样转发给模型，值声明为 Any 以免 pydantic 逐层校验嵌套的 schema
+    properties: Dict[str, Any]
     required: list[str]
     additionalProperties: Optional[bool] = False
 
+    def __hash__(self) -> int:
+        # properties 是字典，无法参与 pydantic 默认生成的哈希，这里只取参数名
+        return hash((tuple(sorted(self.properties)), tuple(self.required)))
+
+@lru_cache(maxsize=256)
+def _cached_input_schema(schema_json: bytes) -> Union[ToolInputSchema, dict]:
+    schema = json_loads(schema_json)
+    try:
+        return ToolInputSchema.model_validate(schema)
+    except ValidationError:
+        # 与 Tool.parameters 的联合类型一致，不符合 ToolInputSchema 时保留原始字典
+        return schema
+
+
+def build_tool_input_schema(schema: dict) -> Union[ToolInputSchema, dict]:
+    """
+    将工具的 JSON Schema 转换为 Tool.parameters，相同的 schema 直接复用已校验的实例。
+    MCP 等来源的工具列表通常不变，每次构造 Tool 时不必重新校验参数格式。
+    返回的实例会被多个 Tool 共享，不应修改。
+    """
+    return _cached_input_schema(json_dumps(schema))
+
+
 class Tool(BaseModel):
     """
     传递给 LLM 的工具信息
@@ -100,7 +155,18 @@ class Tool(BaseModel):
     
     invokeFunc: CallableWrapper[ToolInvokeFunc] = Field(exclude=True)
     
-    model_config = ConfigDict(arbitrary_types_allowed=True)
+    # 工具在多个请求之间共享，构造后不再修改
+    model_config = ConfigDict(arbitrary_types_allowed=True, defer_build=True, frozen=True)
+
+    def __hash__(self) -> int:
+        if isinstance(self.parameters, ToolInputSchema):
+            properties, required = self.parameters.properties, self.parameters.required
+        else:
+            # 不符合 ToolInputSchema 的原始字典中，properties / required 可能缺失或不是预期的类型
+            properties, required = self.parameters.get("properties"), self.parameters.get("required")
+            properties = properties if isinstance(properties, dict) else {}
+            required = required if isinstance(required, list) else []
+        return hash((self.name, self.description, tuple(sorted(properties)), tuple(required)))
     
     @field_serializer("invokeFunc")
     def serialize_invoke_func(self, invoke_func: CallableWrapper[ToolInvokeFunc]) -> str:
@@ -142,13 +142,16 @@ class MCPServerManager:
     
     def disconnect_all_servers(self, loop: asyncio.AbstractEventLoop):
         """断开所有MCP服务器连接"""
-        disconnect_tasks = []
-        for server_id, server in self.servers.items():
-            if server.state == MCPConnectionState.CONNECTED:
-                disconnect_tasks.append(loop.create_task(self.stop_server(server_id)))
-        
-        if disconnect_tasks:
-            loop.run_until_complete(asyncio.gather(*disconnect_tasks, return_exceptions=True))
+        loop.run_until_complete(self.disconnect_all_servers_async())
+
+    async def disconnect_all_servers_async(self):
+        """在当前事件循环中并发断开所有MCP服务器连接"""
+        server_ids = [
+            server_id for server_id, server in self.servers.items()
+            if server.state == MCPConnectionState.CONNECTED
+        ]
+        if server_ids:
+            await asyncio.gather(*(self.stop_server(server_id) for server_id in server_ids), return_exceptions=True)
             
         self.tools_cache.clear()
         
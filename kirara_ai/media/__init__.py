@@ -1,8 +1,12 @@
-from kirara_ai.media.manager import MediaManager
-from kirara_ai.media.media_object import Media
-from kirara_ai.media.metadata import MediaMetadata
-from kirara_ai.media.types import MediaType
-from kirara_ai.media.utils import detect_mime_type
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from kirara_ai.media.manager import MediaManager
+    from kirara_ai.media.media_object import Media
+    from kirara_ai.media.metadata import MediaMetadata
+    from kirara_ai.media.types import MediaType
+    from kirara_ai.media.utils import detect_mime_type
 
 __all__ = [
     "Media",
@@ -11,3 +15,22 @@ __all__ = [
     "MediaType",
     "detect_mime_type",
 ]
+
+# 导出名称 -> 所在模块。导入 kirara_ai.media.types 等子模块时不必连带加载媒体管理器及其依赖
+_LAZY_EXPORTS = {
+    "Media": "kirara_ai.media.media_object",
+    "MediaManager": "kirara_ai.media.manager",
+    "MediaMetadata": "kirara_ai.media.metadata",
+    "MediaType": "kirara_ai.media.types",
+    "detect_mime_type": "kirara_ai.media.utils",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name), name)
+    # 缓存到模块字典中，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
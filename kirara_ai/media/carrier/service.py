@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional, Tuple
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from kirara_ai.ioc.container import DependencyContainer
 from kirara_ai.media.manager import MediaManager
@@ -28,7 +29,7 @@ class MediaCarrierService:
                 # 尝试从引用键中提取提供者名称
                 if ":" in reference_key:
                     provider_name, _ = reference_key.split(":", 1)
-                    self._reference_index[reference_key] = (provider_name, media_id)
+                    self._reference_index[reference_key] = (sys.intern(provider_name), media_id)
     
     def register_reference(self, media_id: str, provider_name: str, reference_key: str) -> None:
         """注册媒体引用"""
@@ -36,8 +37,9 @@ class MediaCarrierService:
         if media_id not in self.media_manager.metadata_cache:
             raise ValueError(f"媒体不存在: {media_id}")
         
-        # 构造完整引用键
-        full_reference_key = f"{provider_name}:{reference_key}"
+        # 构造完整引用键，驻留后与元数据中保存的引用键共享同一个对象
+        full_reference_key = sys.intern(f"{provider_name}:{reference_key}")
+        provider_name = sys.intern(provider_name)
         
         # 添加引用
         self.media_manager.add_reference(media_id, full_reference_key)
@@ -75,31 +77,27 @@ class MediaCarrierService:
     
     def get_media_by_reference(self, provider_name: str, reference_key: str) -> List[Media]:
         """根据引用键获取媒体对象"""
-        full_reference_key = f"{provider_name}:{reference_key}"
-        
-        result = []
-        for ref_key, (prov_name, media_id) in self._reference_index.items():
-            if ref_key == full_reference_key:
-                media = self.media_manager.get_media(media_id)
-                if media:
-                    result.append(media)
-        
-        return result
-    
+        entry = self._reference_index.get(f"{provider_name}:{reference_key}")
+        if entry is None:
+            return []
+        media = self.media_manager.get_media(entry[1])
+        return [media] if media else []
+
     def get_references_by_media(self, media_id: str) -> List[Tuple[str, str]]:
         """获取媒体的所有引用信息"""
-        if media_id not in self.media_manager.metadata_cache:
+        metadata = self.media_manager.metadata_cache.get(media_id)
+        if metadata is None:
             return []
-        
-        metadata = self.media_manager.metadata_cache[media_id]
-        references = []
-        
-        for reference_key in metadata.references:
-            if ":" in reference_key:
-                provider_name, key = reference_key.split(":", 1)
-                references.append((provider_name, key))
-        
-        return references
+        return self._split_references(metadata.references)
+
+    @staticmethod
+    def _split_references(references: Iterable[str]) -> List[Tuple[str, str]]:
+        """将 provider_name:key 形式的引用键拆分为 (provider_name, key)"""
+        return [
+            (provider_name, key)
+            for provider_name, sep, key in (reference_key.partition(":") for reference_key in references)
+            if sep
+        ]
     
     def cleanup_orphaned_references(self) -> int:
         """清理孤立的引用（引用提供者不存在）"""
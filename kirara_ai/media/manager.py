@@ -1,13 +1,20 @@
 import asyncio
-import base64
+import atexit
 import hashlib
-import json
+import os
 import shutil
+import sqlite3
+import sys
+import threading
 import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import TYPE_CHECKING, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, FrozenSet, Hashable, List, Optional, Set, Tuple, Union
 
 import aiofiles
+import aiohttp
 
 from kirara_ai.config.config_loader import CONFIG_FILE, ConfigLoader
 from kirara_ai.config.global_config import GlobalConfig
@@ -15,21 +22,83 @@ from kirara_ai.ioc.container import DependencyContainer
 from kirara_ai.logger import get_logger
 from kirara_ai.media.metadata import MediaMetadata
 from kirara_ai.media.types.media_type import MediaType
-from kirara_ai.media.utils.mime import detect_mime_type
+from kirara_ai.media.utils.mime import MIME_DETECT_BYTES, detect_mime_type
+from kirara_ai.net import client_session
+
+# 发给视觉模型的图片都要编码为 base64，安装了 pybase64 时使用它的 SIMD 实现编码
+try:
+    from pybase64 import b64encode
+except ImportError:
+    from base64 import b64encode
 
 if TYPE_CHECKING:
     from kirara_ai.im.message import MediaMessage
     from kirara_ai.media.media_object import Media
 
+# 下载时每次读取的块大小
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+DOWNLOAD_TIMEOUT = aiohttp.ClientTimeout(total=3000)
+# 批量注册媒体时的最大并发数
+REGISTER_CONCURRENCY = 16
+# 已确认存在的媒体文件路径的缓存时间（秒），期间重复获取同一媒体的路径时不必再 stat 文件
+FILE_PATH_CACHE_TTL = 1.0
+# register_media 接受的二进制数据类型，bytearray、memoryview 等缓冲区无需先复制为 bytes
+BytesLike = Union[bytes, bytearray, memoryview]
+# 写入不小于该大小的数据前先预分配磁盘空间，减少文件逐步扩展造成的碎片和元数据更新
+PREALLOCATE_THRESHOLD = 256 * 1024
+# 元数据数据库文件名，位于媒体目录下
+METADATA_DB_FILE = "metadata.db"
+# 元数据修改后延迟写入数据库的时间，窗口内对同一媒体的多次修改只写入一次
+METADATA_FLUSH_DELAY = 0.2
+# 已导入数据库的旧版 JSON 元数据文件会加上该后缀保留
+MIGRATED_SUFFIX = ".migrated"
+
+
+async def _encode_base64_chunks(chunks: AsyncIterator[bytes]) -> str:
+    """
+    逐块进行 base64 编码。
+    每次只编码长度为 3 的整数倍的部分，剩余字节留到下一块，结果与一次性编码完全相同，
+    但不需要先把完整的原始数据读入内存。
+    """
+    encoded = bytearray()
+    pending = b""
+    async for chunk in chunks:
+        data = pending + chunk
+        aligned = len(data) - len(data) % 3
+        encoded += b64encode(data[:aligned])
+        pending = data[aligned:]
+    encoded += b64encode(pending)
+    return encoded.decode("ascii")
+
 
 class MediaManager:
     """媒体管理器，负责媒体文件的注册、引用计数和生命周期管理"""
-    
+
+    # 元数据数据库连接和延迟写入的定时器，在类上声明默认值，单例重新初始化时据此判断是否已打开过数据库
+    _db: Optional[sqlite3.Connection] = None
+    _flush_timer: Optional[threading.Timer] = None
+
     def __init__(self, media_dir: str = "data/media"):
+        # MediaManager 是单例，重新初始化时先写入尚未保存的元数据并关闭旧的数据库连接
+        if self._db is not None:
+            self.flush_metadata()
+            self._db.close()
+        else:
+            atexit.register(self.flush_metadata)
         self.media_dir = Path(media_dir)
         self.metadata_dir = self.media_dir / "metadata"
         self.files_dir = self.media_dir / "files"
         self.metadata_cache: Dict[str, MediaMetadata] = {}
+        # 没有任何引用的媒体ID，随元数据的加载、保存和删除同步更新，清理时不必遍历全部元数据
+        self._unreferenced_ids: Set[str] = set()
+        # 标签、媒体类型和来源（小写）的倒排索引，用 dict 作为保持插入顺序的集合，搜索结果的顺序保持稳定
+        self._tag_index: Dict[str, Dict[str, None]] = defaultdict(dict)
+        self._type_index: Dict[MediaType, Dict[str, None]] = defaultdict(dict)
+        self._source_index: Dict[str, Dict[str, None]] = defaultdict(dict)
+        # 每个媒体当前写入索引的值，元数据对象会被原地修改，更新索引时需要据此找到旧值
+        self._indexed_values: Dict[str, Tuple[FrozenSet[str], Optional[MediaType], Optional[str]]] = {}
+        # media_id -> (文件路径, 过期时间)，由 get_file_path 填充
+        self._path_cache: Dict[str, Tuple[Path, float]] = {}
         self.logger = get_logger("MediaManager")
         self._pending_tasks: set[asyncio.Task] = set()
         
@@ -38,59 +107,262 @@ class MediaManager:
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
         self.files_dir.mkdir(parents=True, exist_ok=True)
         self._cleanup_task = None
-        
+
+        self._db = self._open_db(self.media_dir / METADATA_DB_FILE)
+        # 媒体可能在其他线程的事件循环中注册，数据库写入需要加锁
+        self._db_lock = threading.Lock()
+        # 已修改但尚未写入数据库的元数据，media_id -> 保存时序列化的数据
+        self._dirty: Dict[str, bytes] = {}
+        self._flush_timer = None
+        self._migrate_json_metadata()
+
         # 加载所有元数据
         self._load_all_metadata()
-        
+
+    @property
+    def _metadata_db(self) -> sqlite3.Connection:
+        if self._db is None:
+            raise RuntimeError("Media metadata database is not opened")
+        return self._db
+
+    @staticmethod
+    def _open_db(db_path: Path) -> sqlite3.Connection:
+        """打开元数据数据库，WAL 模式下单行写入不需要重写整个文件"""
+        db = sqlite3.connect(db_path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("CREATE TABLE IF NOT EXISTS media (media_id TEXT PRIMARY KEY, data BLOB NOT NULL)")
+        db.commit()
+        return db
+
+    def _migrate_json_metadata(self) -> None:
+        """
+        将旧版本按文件保存的 JSON 元数据导入数据库。
+        导入成功的文件重命名为 *.json.migrated 保留下来，降级版本或数据库损坏时可以改回原名恢复。
+        """
+        # scandir 返回的目录项自带文件类型，不需要像 glob 那样为每个文件构造 Path 并额外 stat
+        with os.scandir(self.metadata_dir) as entries:
+            metadata_files = [entry.path for entry in entries if entry.name.endswith(".json") and entry.is_file()]
+
+        if not metadata_files:
+            return
+
+        # 大量小文件的读取耗时主要在打开文件的 IO 等待上，用线程池并发读取
+        with ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 4) * 4)) as pool:
+            contents = list(pool.map(self._read_legacy_metadata, metadata_files))
+
+        migrated = []
+        for metadata_file, data in zip(metadata_files, contents):
+            if data is None:
+                continue
+            try:
+                metadata = MediaMetadata.from_json(data)
+            except Exception as e:
+                self.logger.error(f"Failed to migrate metadata from {metadata_file}: {e}")
+                continue
+            migrated.append((metadata_file, metadata))
+        if not migrated:
+            return
+
+        with self._db_lock, self._metadata_db:
+            self._metadata_db.executemany(
+                "INSERT OR REPLACE INTO media (media_id, data) VALUES (?, ?)",
+                [(metadata.media_id, metadata.to_json()) for _, metadata in migrated],
+            )
+        for metadata_file, _ in migrated:
+            try:
+                os.replace(metadata_file, metadata_file + MIGRATED_SUFFIX)
+            except OSError as e:
+                self.logger.warning(f"Failed to rename migrated metadata file {metadata_file}: {e}")
+        self.logger.info(f"Migrated {len(migrated)} media metadata files to {METADATA_DB_FILE}")
+
+    def _read_legacy_metadata(self, metadata_file: str) -> Optional[bytes]:
+        """读取旧版本的元数据文件，读取失败时返回 None"""
+        try:
+            with open(metadata_file, "rb") as f:
+                return f.read()
+        except OSError as e:
+            self.logger.error(f"Failed to read metadata from {metadata_file}: {e}")
+            return None
+
     def _load_all_metadata(self) -> None:
         """加载所有媒体元数据"""
         self.metadata_cache.clear()
-        for metadata_file in self.metadata_dir.glob("*.json"):
+        self._unreferenced_ids.clear()
+        for index in (self._tag_index, self._type_index, self._source_index, self._indexed_values, self._path_cache):
+            index.clear()
+        with self._db_lock:
+            rows = self._metadata_db.execute("SELECT media_id, data FROM media").fetchall()
+        for media_id, data in rows:
             try:
-                with open(metadata_file, "r", encoding="utf-8") as f:
-                    metadata = MediaMetadata.from_dict(json.load(f))
-                    self.metadata_cache[metadata.media_id] = metadata
+                metadata = MediaMetadata.from_json(data)
             except Exception as e:
-                self.logger.error(f"Failed to load metadata from {metadata_file}: {e}")
-                
+                self.logger.error(f"Failed to load metadata of media {media_id}: {e}")
+                continue
+            self.metadata_cache[metadata.media_id] = metadata
+            self._update_unreferenced(metadata)
+            self._update_search_index(metadata)
+
     def _save_metadata(self, metadata: MediaMetadata) -> None:
-        """保存媒体元数据"""
-        metadata_path = self.metadata_dir / f"{metadata.media_id}.json"
-        with open(metadata_path, "w", encoding="utf-8") as f:
-            json.dump(metadata.to_dict(), f, ensure_ascii=False, indent=2)
+        """
+        保存媒体元数据。
+        缓存立即更新，数据库写入会延迟 METADATA_FLUSH_DELAY 秒，并与窗口内的其他修改合并到同一个事务中。
+        """
         self.metadata_cache[metadata.media_id] = metadata
-        
+        self._update_unreferenced(metadata)
+        self._update_search_index(metadata)
+        # 元数据对象会在调用方线程中被原地修改，在这里序列化，写入线程只处理序列化好的数据
+        data = metadata.to_json()
+        with self._db_lock:
+            self._dirty[metadata.media_id] = data
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(METADATA_FLUSH_DELAY, self.flush_metadata)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+
+    def flush_metadata(self) -> None:
+        """立即将所有尚未保存的元数据写入数据库"""
+        with self._db_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            rows = list(self._dirty.items())
+            self._dirty.clear()
+            try:
+                with self._metadata_db:
+                    self._metadata_db.executemany("INSERT OR REPLACE INTO media (media_id, data) VALUES (?, ?)", rows)
+            except Exception as e:
+                # 定时器线程中的异常不会被处理，写入失败的数据放回待写入队列，在下一次保存或退出时重试
+                self.logger.error(f"Failed to save metadata of {len(rows)} media: {e}")
+                self._dirty.update(rows)
+
+    def _update_unreferenced(self, metadata: MediaMetadata) -> None:
+        """根据引用情况更新无引用媒体索引"""
+        if metadata.references:
+            self._unreferenced_ids.discard(metadata.media_id)
+        else:
+            self._unreferenced_ids.add(metadata.media_id)
+
+    @staticmethod
+    def _discard_from_index(index: Dict[Any, Dict[str, None]], key: Hashable, media_id: str) -> None:
+        """从倒排索引的某一项中移除媒体，项为空时一并删除"""
+        media_ids = index.get(key)
+        if media_ids is not None:
+            media_ids.pop(media_id, None)
+            if not media_ids:
+                del index[key]
+
+    def _update_search_index(self, metadata: MediaMetadata) -> None:
+        """根据元数据的标签、类型和来源更新倒排索引，只调整发生变化的部分"""
+        media_id = metadata.media_id
+        new_tags = frozenset(metadata.tags)
+        new_type = metadata.media_type
+        new_source = metadata.source.lower() if metadata.source else None
+        old_tags, old_type, old_source = self._indexed_values.get(media_id, (frozenset(), None, None))
+
+        for tag in old_tags - new_tags:
+            self._discard_from_index(self._tag_index, tag, media_id)
+        for tag in new_tags - old_tags:
+            self._tag_index[tag][media_id] = None
+        if old_type != new_type:
+            self._discard_from_index(self._type_index, old_type, media_id)
+            if new_type is not None:
+                self._type_index[new_type][media_id] = None
+        if old_source != new_source:
+            self._discard_from_index(self._source_index, old_source, media_id)
+            if new_source is not None:
+                self._source_index[new_source][media_id] = None
+        self._indexed_values[media_id] = (new_tags, new_type, new_source)
+
+    def _remove_from_search_index(self, media_id: str) -> None:
+        """从倒排索引中移除媒体"""
+        tags, media_type, source = self._indexed_values.pop(media_id, (frozenset(), None, None))
+        for tag in tags:
+            self._discard_from_index(self._tag_index, tag, media_id)
+        self._discard_from_index(self._type_index, media_type, media_id)
+        self._discard_from_index(self._source_index, source, media_id)
+
     def _get_file_path(self, media_id: str, format: str) -> Path:
         """获取媒体文件路径"""
         return self.files_dir / f"{media_id}.{format}"
     
     def _create_task(self, coro, name=None, loop=None):
-        """创建后台任务并跟踪它"""
+        """创建后台任务并跟踪它，未指定事件循环时使用当前正在运行的事件循环"""
         if loop is None:
-            loop = asyncio.get_event_loop()
-        task = asyncio.ensure_future(coro, loop=loop)
+            loop = asyncio.get_running_loop()
+        task = loop.create_task(coro, name=name)
         self._pending_tasks.add(task)
         task.add_done_callback(self._pending_tasks.discard)
         return task
     
-    async def _save_file_async(self, data: bytes, target_path: Path):
+    async def _save_file_async(self, data: BytesLike, target_path: Path):
         """异步保存文件"""
         async with aiofiles.open(target_path, "wb") as f:
+            if len(data) >= PREALLOCATE_THRESHOLD and hasattr(os, "posix_fallocate"):
+                try:
+                    await asyncio.to_thread(os.posix_fallocate, f.fileno(), 0, len(data))
+                except OSError as e:
+                    # 部分文件系统不支持预分配，直接写入即可
+                    self.logger.debug(f"Failed to preallocate {target_path}: {e}")
             await f.write(data)
     
+    def _temp_file_path(self) -> Path:
+        """媒体目录下的临时文件路径，写入完成后再用 os.replace 移动到最终位置，失败时不会留下不完整的文件"""
+        return self.files_dir / f".{uuid.uuid4().hex}.download"
+
+    async def _copy_file_async(self, source_path: Path, target_path: Path) -> None:
+        """在线程中复制文件，避免大文件复制阻塞事件循环（Linux 下 shutil 会使用 sendfile 在内核中完成复制）"""
+        temp_path = self._temp_file_path()
+        try:
+            await asyncio.to_thread(shutil.copy2, source_path, temp_path)
+            os.replace(temp_path, target_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    async def _iter_file_chunks(self, path: Union[str, Path]) -> AsyncIterator[bytes]:
+        """以流的方式逐块读取本地文件"""
+        async with aiofiles.open(path, "rb") as f:
+            while chunk := await f.read(DOWNLOAD_CHUNK_SIZE):
+                yield chunk
+
+    async def _iter_url_chunks(self, url: str) -> AsyncIterator[bytes]:
+        """以流的方式逐块读取 URL 对应的内容"""
+        # 如果 url 是 file:// 开头，则直接读取文件内容
+        if url.startswith("file://"):
+            async for chunk in self._iter_file_chunks(url[7:]):
+                yield chunk
+            return
+        async with client_session() as session:
+            async with session.get(url, timeout=DOWNLOAD_TIMEOUT) as resp:
+                if resp.status != 200:
+                    raise ValueError(f"Failed to download file from {url}, status: {resp.status}")
+                async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    yield chunk
+
     async def _download_file_async(self, url: str) -> bytes:
         """异步下载文件"""
-        from curl_cffi import AsyncSession, Response
+        return b"".join([chunk async for chunk in self._iter_url_chunks(url)])
 
-        # 如果 url 是 file:// 开头，则直接返回文件内容
-        if url.startswith("file://"):
-            async with aiofiles.open(url[7:], "rb") as f:
-                return await f.read()
-        async with AsyncSession(trust_env=True, timeout=3000) as session:
-            resp: Response = await session.get(url)
-            if resp.status_code != 200:
-                raise ValueError(f"Failed to download file from {url}, status: {resp.status_code}")
-            return resp.content
+    async def _write_chunks_async(self, chunks: AsyncIterator[bytes], target_path: Path) -> Tuple[str, bytes]:
+        """
+        将数据块流式写入目标路径，返回内容的 SHA1 和开头的 MIME_DETECT_BYTES 字节。
+        开头部分足以检测 MIME 类型，检测时不必再重新读取整个文件。
+        """
+        sha1 = hashlib.sha1()
+        head = bytearray()
+        async with aiofiles.open(target_path, "wb") as f:
+            async for chunk in chunks:
+                sha1.update(chunk)
+                if len(head) < MIME_DETECT_BYTES:
+                    head += chunk[:MIME_DETECT_BYTES - len(head)]
+                await f.write(chunk)
+        return sha1.hexdigest(), bytes(head)
+
+    async def _download_to_file_async(self, url: str, target_path: Path) -> Tuple[str, bytes]:
+        """异步下载文件并流式写入目标路径，返回文件内容的 SHA1 和开头部分的数据"""
+        return await self._write_chunks_async(self._iter_url_chunks(url), target_path)
     
     def _download_file_sync(self, url: str) -> bytes:
         """同步下载文件"""
@@ -110,7 +382,7 @@ class MediaManager:
         self,
         url: Optional[str] = None,
         path: Optional[str] = None,
-        data: Optional[bytes] = None,
+        data: Optional[BytesLike] = None,
         format: Optional[str] = None,
         media_type: Optional[MediaType] = None,
         size: Optional[int] = None,
@@ -141,57 +413,67 @@ class MediaManager:
         if not any([url, path, data]):
             raise ValueError("Must provide at least one of url, path, or data")
 
-        # 获取数据
+        # 获取数据，文件和 URL 都流式写入临时文件，边写入边计算 SHA1，避免整个文件驻留内存
+        chunks: Optional[AsyncIterator[bytes]] = None
         if path:
             file_path = Path(path)
             if not file_path.exists():
                 raise FileNotFoundError(f"File not found: {path}")
-            try:
-                async with aiofiles.open(file_path, "rb") as f:
-                    data = await f.read()
-            except Exception as e:
-                self.logger.error(f"Failed to read file: {e}", exc_info=True)
-                raise
+            chunks = self._iter_file_chunks(file_path)
         elif url:
-            try:
-                data = await self._download_file_async(url)
-            except Exception as e:
-                self.logger.error(f"Failed to download file: {e}", exc_info=True)
-                raise
-
-        # 计算 SHA1
-        if data is None:
-            raise ValueError("Unable to fetch data from url or path, please check your input")
-        
-        hash_data = await asyncio.to_thread(hashlib.sha1, data)
-        media_id = hash_data.hexdigest()
-
-        # 检查是否已存在相同 media_id 的媒体
-        if media_id in self.metadata_cache:
-            self.logger.info(f"Media already exists: {media_id}")
-            return media_id
-
-        # 获取数据大小
-        if not size:
-            size = len(data)
-
-        # 检测文件类型
-        if not media_type or not format:
-            mime_type, detected_media_type, detected_format = detect_mime_type(data=data)
-            media_type = media_type or detected_media_type
-            format = format or detected_format
-
-        # 保存文件
-        if format:
-            target_path = self._get_file_path(media_id, format)
-            try:
-                await self._save_file_async(data, target_path)
-            except Exception as e:
-                self.logger.error(f"Failed to save file: {e}", exc_info=True)
-                raise
-            path = str(target_path)
-        else:
-            raise ValueError("No format detected")
+            chunks = self._iter_url_chunks(url)
+        downloaded_path = self._temp_file_path() if chunks else None
+
+        try:
+            if chunks and downloaded_path:
+                try:
+                    media_id, data = await self._write_chunks_async(chunks, downloaded_path)
+                except Exception as e:
+                    self.logger.error(f"Failed to {'read' if path else 'download'} file: {e}", exc_info=True)
+                    raise
+            else:
+                # 计算 SHA1
+                if data is None:
+                    raise ValueError("Unable to fetch data from url or path, please check your input")
+
+                # 按字节视图访问数据，后续的哈希、类型检测和写入都直接使用调用方的缓冲区
+                data = memoryview(data).cast("B")
+                hash_data = await asyncio.to_thread(hashlib.sha1, data)
+                media_id = hash_data.hexdigest()
+
+            # 检查是否已存在相同 media_id 的媒体
+            if media_id in self.metadata_cache:
+                self.logger.info(f"Media already exists: {media_id}")
+                return media_id
+
+            # 获取数据大小
+            if not size:
+                size = downloaded_path.stat().st_size if downloaded_path else len(data)
+
+            # 检测文件类型，流式写入时 data 只包含文件开头的部分
+            mime_type: Optional[str] = None
+            if not media_type or not format:
+                mime_type, detected_media_type, detected_format = detect_mime_type(data=data)
+                media_type = media_type or detected_media_type
+                format = format or detected_format
+
+            # 保存文件
+            if format:
+                target_path = self._get_file_path(media_id, format)
+                try:
+                    if downloaded_path:
+                        os.replace(downloaded_path, target_path)
+                    else:
+                        await self._save_file_async(data, target_path)
+                except Exception as e:
+                    self.logger.error(f"Failed to save file: {e}", exc_info=True)
+                    raise
+                path = str(target_path)
+            else:
+                raise ValueError("No format detected")
+        finally:
+            if downloaded_path:
+                downloaded_path.unlink(missing_ok=True)
         
         # 创建元数据
         metadata = MediaMetadata(
@@ -206,6 +488,7 @@ class MediaManager:
             references=set([reference_id]) if reference_id else set(),
             url=url,
             path=path,
+            mime_type=mime_type,
         )
 
         # 保存元数据
@@ -213,6 +496,41 @@ class MediaManager:
         self.logger.info(f"Registered media: {media_id}")
         return media_id
     
+    async def register_many(self, specs: List[Dict[str, Any]], limit: int = REGISTER_CONCURRENCY) -> List[str]:
+        """
+        并发注册多个媒体
+
+        Args:
+            specs: 每个元素为 register_media 的关键字参数
+            limit: 最大并发数
+
+        Returns:
+            List[str]: 与 specs 顺序一致的媒体ID列表
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def register_one(spec: Dict[str, Any]) -> str:
+            async with semaphore:
+                return await self.register_media(**spec)
+
+        return list(await asyncio.gather(*(register_one(spec) for spec in specs)))
+
+    async def register_media_batch(
+        self, specs: List[Dict[str, Any]], limit: int = REGISTER_CONCURRENCY
+    ) -> List[Tuple[str, Optional[MediaMetadata]]]:
+        """
+        批量注册媒体并一并返回元数据，供一次构造多个媒体消息时使用
+
+        Args:
+            specs: 每个元素为 register_media 的关键字参数
+            limit: 最大并发数
+
+        Returns:
+            List[Tuple[str, Optional[MediaMetadata]]]: 与 specs 顺序一致的 (媒体ID, 元数据) 列表
+        """
+        media_ids = await self.register_many(specs, limit)
+        return [(media_id, self.metadata_cache.get(media_id)) for media_id in media_ids]
+    
     async def register_from_path(
         self, 
         path: str, 
@@ -254,7 +572,7 @@ class MediaManager:
     
     async def register_from_data(
         self, 
-        data: bytes,
+        data: BytesLike,
         format: Optional[str] = None,
         source: Optional[str] = None,
         description: Optional[str] = None,
@@ -279,7 +597,7 @@ class MediaManager:
             raise ValueError(f"Media not found: {media_id}")
         
         metadata = self.metadata_cache[media_id]
-        metadata.references.add(reference_id)
+        metadata.references.add(sys.intern(reference_id))
         self._save_metadata(metadata)
         
     def remove_reference(self, media_id: str, reference_id: str) -> None:
@@ -312,12 +630,15 @@ class MediaManager:
                 file_path.unlink()
         
         # 删除元数据
-        metadata_path = self.metadata_dir / f"{media_id}.json"
-        if metadata_path.exists():
-            metadata_path.unlink()
+        with self._db_lock, self._metadata_db:
+            self._dirty.pop(media_id, None)
+            self._metadata_db.execute("DELETE FROM media WHERE media_id = ?", (media_id,))
         
         # 从缓存中移除
         del self.metadata_cache[media_id]
+        self._unreferenced_ids.discard(media_id)
+        self._remove_from_search_index(media_id)
+        self._path_cache.pop(media_id, None)
         
         self.logger.info(f"Deleted media: {media_id}")
     
@@ -337,19 +658,20 @@ class MediaManager:
         metadata = self.metadata_cache[media_id]
         
         if source is not None:
-            metadata.source = source
+            metadata.source = sys.intern(source)
         
         if description is not None:
             metadata.description = description
         
         if tags is not None:
-            metadata.tags = tags
+            metadata.tags = [sys.intern(tag) for tag in tags]
             
         if url is not None:
             metadata.url = url
             
         if path is not None:
             metadata.path = path
+            self._path_cache.pop(media_id, None)
         
         self._save_metadata(metadata)
     
@@ -361,7 +683,7 @@ class MediaManager:
         metadata = self.metadata_cache[media_id]
         for tag in tags:
             if tag not in metadata.tags:
-                metadata.tags.append(tag)
+                metadata.tags.append(sys.intern(tag))
         
         self._save_metadata(metadata)
     
@@ -398,9 +720,10 @@ class MediaManager:
                     if not file_path.exists():
                         return None
                     
-                    _, media_type, format = detect_mime_type(path=str(file_path))
+                    mime_type, media_type, format = detect_mime_type(path=str(file_path))
                     
                     # 更新元数据
+                    metadata.mime_type = mime_type
                     metadata.media_type = media_type
                     metadata.format = format
                     metadata.size = file_path.stat().st_size
@@ -408,7 +731,7 @@ class MediaManager:
                     
                     # 复制文件
                     target_path = self._get_file_path(media_id, format)
-                    shutil.copy2(file_path, target_path)
+                    await self._copy_file_async(file_path, target_path)
                     
                     return target_path
                 except Exception as e:
@@ -416,24 +739,28 @@ class MediaManager:
                     return None
                         # 如果有URL，尝试下载并检测格式
             elif metadata.url:
+                downloaded_path = self._temp_file_path()
                 try:
-                    data = await self._download_file_async(metadata.url)
-                    _, media_type, format = detect_mime_type(data=data)
+                    _, head = await self._download_to_file_async(metadata.url, downloaded_path)
+                    mime_type, media_type, format = detect_mime_type(data=head)
                     
                     # 更新元数据
+                    metadata.mime_type = mime_type
                     metadata.media_type = media_type
                     metadata.format = format
-                    metadata.size = len(data)
+                    metadata.size = downloaded_path.stat().st_size
                     self._save_metadata(metadata)
                     
                     # 保存文件
                     target_path = self._get_file_path(media_id, format)
-                    await self._save_file_async(data, target_path)
+                    os.replace(downloaded_path, target_path)
                     
                     return target_path
                 except Exception as e:
                     self.logger.error(f"Failed to download media from URL: {metadata.url}, error: {e}")
                     return None
+                finally:
+                    downloaded_path.unlink(missing_ok=True)
                 
             return None
         
@@ -444,19 +771,22 @@ class MediaManager:
         
         # 如果文件不存在，尝试从URL下载
         if metadata.url:
+            downloaded_path = self._temp_file_path()
             try:
-                data = await self._download_file_async(metadata.url)
-                await self._save_file_async(data, file_path)
+                await self._download_to_file_async(metadata.url, downloaded_path)
+                os.replace(downloaded_path, file_path)
                 return file_path
             except Exception as e:
                 self.logger.error(f"Failed to download media from URL: {metadata.url}, error: {e}")
+            finally:
+                downloaded_path.unlink(missing_ok=True)
         
         # 如果文件不存在，尝试从path复制
         if metadata.path:
             try:
                 source_path = Path(metadata.path)
                 if source_path.exists():
-                    shutil.copy2(source_path, file_path)
+                    await self._copy_file_async(source_path, file_path)
                     return file_path
             except Exception as e:
                 self.logger.error(f"Failed to copy media from path: {metadata.path}, error: {e}")
@@ -467,15 +797,25 @@ class MediaManager:
         """获取媒体文件路径，如果文件不存在则尝试下载或复制"""
         if media_id not in self.metadata_cache:
             return None
+
+        # 短时间内重复获取同一媒体时直接使用缓存的路径
+        now = time.monotonic()
+        cached = self._path_cache.get(media_id)
+        if cached is not None and cached[1] > now:
+            return cached[0]
         
         metadata = self.metadata_cache[media_id]
         
         # 如果有原始路径，直接返回
         if metadata.path and Path(metadata.path).exists():
-            return Path(metadata.path)
-        
-        # 否则确保文件存在并返回
-        return await self.ensure_file_exists(media_id)
+            file_path: Optional[Path] = Path(metadata.path)
+        else:
+            # 否则确保文件存在并返回
+            file_path = await self.ensure_file_exists(media_id)
+
+        if file_path is not None:
+            self._path_cache[media_id] = (file_path, now + FILE_PATH_CACHE_TTL)
+        return file_path
     
     async def get_data(self, media_id: str) -> Optional[bytes]:
         """获取媒体文件数据"""
@@ -514,85 +854,102 @@ class MediaManager:
             return metadata.url
         
         # 尝试生成data URL
-        data = await self.get_data(media_id)
-        if data and metadata.media_type and metadata.format:
-            mime_type = f"{metadata.media_type.value}/{metadata.format}"
-            return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
-        
-        return None
+        return await self.get_base64_url(media_id)
     
+    async def get_base64(self, media_id: str) -> Optional[str]:
+        """获取媒体文件 base64 编码，边读取边编码，不需要先把完整数据读入内存"""
+        if media_id not in self.metadata_cache:
+            return None
+        return await self._encode_base64(media_id)
+
     async def get_base64_url(self, media_id: str) -> Optional[str]:
         """获取媒体文件 base64 URL"""
         if media_id not in self.metadata_cache:
             return None
         
         metadata = self.metadata_cache[media_id]
+        if not metadata.media_type or not metadata.format:
+            return None
         
-        data = await self.get_data(media_id)
-        if data and metadata.media_type and metadata.format:
-            mime_type = f"{metadata.media_type.value}/{metadata.format}"
-            return f"data:{mime_type};base64,{base64.b64encode(data).decode()}"
+        encoded = await self._encode_base64(media_id)
+        if encoded:
+            return f"data:{metadata.mime_type};base64,{encoded}"
         
         return None
+
+    async def _encode_base64(self, media_id: str) -> Optional[str]:
+        """流式读取媒体数据并编码为 base64，数据来源与 get_data 相同：优先读取文件，其次从 URL 下载"""
+        metadata = self.metadata_cache[media_id]
+
+        file_path = await self.get_file_path(media_id)
+        if file_path:
+            try:
+                return await _encode_base64_chunks(self._iter_file_chunks(file_path))
+            except Exception as e:
+                self.logger.error(f"Failed to read media file: {file_path}, error: {e}")
+
+        if metadata.url:
+            try:
+                return await _encode_base64_chunks(self._iter_url_chunks(metadata.url))
+            except Exception as e:
+                self.logger.error(f"Failed to download media from URL: {metadata.url}, error: {e}")
+
+        return None
     
 
     def search_by_tags(self, tags: List[str], match_all: bool = False) -> List[str]:
         """根据标签搜索媒体"""
-        results = []
-        
-        for media_id, metadata in self.metadata_cache.items():
-            if match_all:
-                # 必须匹配所有标签
-                if all(tag in metadata.tags for tag in tags):
-                    results.append(media_id)
-            else:
-                # 匹配任一标签
-                if any(tag in metadata.tags for tag in tags):
-                    results.append(media_id)
-        
-        return results
+        postings = [self._tag_index.get(tag, {}) for tag in dict.fromkeys(tags)]
+        if match_all:
+            # 必须匹配所有标签，从命中最少的标签开始筛选
+            if not postings:
+                return list(self.metadata_cache)
+            smallest = min(postings, key=len)
+            return [media_id for media_id in smallest if all(media_id in media_ids for media_ids in postings)]
+        # 匹配任一标签
+        return list(dict.fromkeys(media_id for media_ids in postings for media_id in media_ids))
     
     def search_by_description(self, query: str) -> List[str]:
         """根据描述搜索媒体"""
-        results = []
-        
-        for media_id, metadata in self.metadata_cache.items():
-            if metadata.description and query.lower() in metadata.description.lower():
-                results.append(media_id)
-        
-        return results
+        query = query.lower()
+        return [
+            media_id for media_id, metadata in self.metadata_cache.items()
+            if metadata.description and query in metadata.description.lower()
+        ]
     
     def search_by_source(self, source: str) -> List[str]:
-        """根据来源搜索媒体"""
-        results = []
-        
-        for media_id, metadata in self.metadata_cache.items():
-            if metadata.source and source.lower() in metadata.source.lower():
-                results.append(media_id)
-        
-        return results
+        """根据来源搜索媒体，只需遍历不重复的来源"""
+        source = source.lower()
+        return [
+            media_id
+            for indexed_source, media_ids in self._source_index.items()
+            if source in indexed_source
+            for media_id in media_ids
+        ]
     
     def search_by_type(self, media_type: MediaType) -> List[str]:
         """根据媒体类型搜索媒体"""
-        results = []
-        
-        for media_id, metadata in self.metadata_cache.items():
-            if metadata.media_type == media_type:
-                results.append(media_id)
-        
-        return results
+        return list(self._type_index.get(media_type, ()))
     
     def get_all_media_ids(self) -> List[str]:
         """获取所有媒体ID"""
         return list(self.metadata_cache.keys())
     
+    def get_unreferenced_media_ids(self) -> Set[str]:
+        """获取没有任何引用的媒体ID"""
+        return set(self._unreferenced_ids)
+
     def cleanup_unreferenced(self) -> int:
         """清理没有引用的媒体文件，返回清理的文件数量"""
         count = 0
-        for media_id, metadata in list(self.metadata_cache.items()):
-            if not metadata.references:
-                self.delete_media(media_id)
-                count += 1
+        for media_id in list(self._unreferenced_ids):
+            # 引用可能在未保存元数据的情况下被直接修改，删除前再确认一次
+            metadata = self.metadata_cache.get(media_id)
+            if metadata is None or metadata.references:
+                self._unreferenced_ids.discard(media_id)
+                continue
+            self.delete_media(media_id)
+            count += 1
         return count
     
     async def create_media_message(self, media_id: str) -> Optional["MediaMessage"]:
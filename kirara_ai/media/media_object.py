@@ -1,4 +1,3 @@
-import base64
 from pathlib import Path
 from typing import TYPE_CHECKING, List, Optional
 
@@ -11,7 +10,9 @@ from kirara_ai.media.types.media_type import MediaType
 
 class Media:
     """媒体对象，提供更方便的媒体操作接口"""
-    
+
+    __slots__ = ("media_id", "_manager", "metadata")
+
     metadata: MediaMetadata
     
     def __init__(self, media_id: str, media_manager: MediaManager):
@@ -93,9 +94,9 @@ class Media:
     
     async def get_base64(self) -> str:
         """获取媒体文件 base64 编码"""
-        data = await self.get_data()
-        assert data is not None, "Media data is None"
-        return base64.b64encode(data).decode()
+        encoded = await self._manager.get_base64(self.media_id)
+        assert encoded is not None, f"Media data not found for {self.media_id}"
+        return encoded
     
     async def get_url(self) -> str:
         """获取媒体文件URL"""
@@ -1,11 +1,36 @@
+import json
+import sys
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Union
 
 from kirara_ai.media.types.media_type import MediaType
 
+# 元数据在每次修改引用、标签时都会重新序列化，安装了 orjson 时使用它解析和序列化
+try:
+    import orjson
+    from orjson import loads as json_loads
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+    from json import loads as json_loads
+
 
 class MediaMetadata:
     """媒体元数据类"""
+
+    __slots__ = (
+        "media_id",
+        "media_type",
+        "format",
+        "size",
+        "created_at",
+        "source",
+        "description",
+        "tags",
+        "references",
+        "url",
+        "path",
+        "_mime_type",
+    )
     
     def __init__(
         self,
@@ -19,19 +44,24 @@ class MediaMetadata:
         tags: Optional[List[str]] = None,
         references: Optional[Set[str]] = None,
         url: Optional[str] = None,
-        path: Optional[str] = None
+        path: Optional[str] = None,
+        mime_type: Optional[str] = None
     ):
-        self.media_id = media_id
+        # media_id 和引用键会作为字典、集合的键被反复查找，驻留后相同的字符串共享同一个对象，比较时可以直接按地址命中
+        self.media_id = sys.intern(media_id)
         self.media_type = media_type
-        self.format = format
+        # 格式、来源和标签在大量媒体间高度重复，同样驻留以共享字符串对象
+        self.format = sys.intern(format) if format else format
         self.size = size
         self.created_at = created_at or datetime.now()
-        self.source = source
+        self.source = sys.intern(source) if source else source
         self.description = description
-        self.tags: List[str] = tags or []
-        self.references: Set[str] = references or set()
+        self.tags: List[str] = [sys.intern(tag) for tag in tags] if tags else []
+        self.references: Set[str] = {sys.intern(reference) for reference in references} if references else set()
         self.url = url
         self.path = path
+        # 检测文件内容得到的 MIME 类型，保存后读取时无需再次检测
+        self._mime_type = mime_type
         
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典"""
@@ -55,14 +85,25 @@ class MediaMetadata:
             result["url"] = self.url
         if self.path:
             result["path"] = self.path
+        if self._mime_type:
+            result["mime_type"] = self._mime_type
             
         return result
 
+    def to_json(self) -> bytes:
+        """序列化为 UTF-8 编码的 JSON"""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return json.dumps(self.to_dict(), ensure_ascii=False).encode("utf-8")
 
     @property
     def mime_type(self) -> str:
-        """获取 MIME 类型"""
-        return f"{self.media_type.value}/{self.format}"
+        """获取 MIME 类型，未检测过时根据媒体类型和格式推断"""
+        return self._mime_type or f"{self.media_type.value}/{self.format}"
+
+    @mime_type.setter
+    def mime_type(self, value: Optional[str]) -> None:
+        self._mime_type = value
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'MediaMetadata':
@@ -78,5 +119,11 @@ class MediaMetadata:
             tags=data.get("tags", []),
             references=set(data.get("references", [])),
             url=data.get("url"),
-            path=data.get("path")
-        ) 
\ No newline at end of file
+            path=data.get("path"),
+            mime_type=data.get("mime_type")
+        ) 
+
+    @classmethod
+    def from_json(cls, data: Union[bytes, str]) -> 'MediaMetadata':
+        """从 JSON 创建元数据"""
+        return cls.from_dict(json_loads(data))
@@ -1,9 +1,10 @@
-from typing import Optional, Tuple
-
-import magic
+from typing import Optional, Tuple, Union
 
 from kirara_ai.media.types.media_type import MediaType
 
+# libmagic 只需检查文件头部即可判断类型，检测时只传入开头部分，避免读取和扫描整个大文件
+MIME_DETECT_BYTES = 4096
+
 # MIME类型重映射
 mime_remapping = {
     "audio/mpeg": "audio/mp3",
@@ -13,7 +14,9 @@ mime_remapping = {
 }
 
 
-def detect_mime_type(data: Optional[bytes] = None, path: Optional[str] = None) -> Tuple[str, MediaType, str]:
+def detect_mime_type(
+    data: Optional[Union[bytes, bytearray, memoryview]] = None, path: Optional[str] = None
+) -> Tuple[str, MediaType, str]:
     """
     检测文件的MIME类型
     
@@ -24,11 +27,15 @@ def detect_mime_type(data: Optional[bytes] = None, path: Optional[str] = None) -
     Returns:
         Tuple[str, MediaType, str]: (mime_type, media_type, format)
     """
+    # libmagic 的绑定加载较慢，只在真正检测类型时导入
+    import magic
+
     try:
         if data is not None:
-            mime_type = magic.from_buffer(data, mime=True)
+            mime_type = magic.from_buffer(bytes(data[:MIME_DETECT_BYTES]), mime=True)
         elif path is not None:
-            mime_type = magic.from_file(path, mime=True)
+            with open(path, "rb") as f:
+                mime_type = magic.from_buffer(f.read(MIME_DETECT_BYTES), mime=True)
         else:
             raise ValueError("Must provide either data or path")
     except Exception as e:
@@ -24,7 +24,8 @@ class DefaultMemoryComposer(MemoryComposer):
         if self.processor_factory is None:
             self.processor_factory = ProcessorFactory(self.container)
         
-        composed_message = ""
+        # 各条消息组合后的文本片段，最后一次性拼接
+        parts: List[str] = []
         # 上下文用于在处理过程中传递和收集数据
         context: Dict[str, Any] = {
             "media_ids": [],
@@ -37,12 +38,12 @@ class DefaultMemoryComposer(MemoryComposer):
             processor = self.processor_factory.get_processor(msg_type)
             
             if processor:
-                composed_message += processor.process(msg, context)
+                parts.append(processor.process(msg, context))
             elif isinstance(msg, str):
                 # 处理字符串消息
-                composed_message += f"{msg}\n"
+                parts.append(f"{msg}\n")
 
-        composed_message = composed_message.strip()
+        composed_message = "".join(parts).strip()
         composed_at = datetime.now()
         return MemoryEntry(
             sender=sender or ChatSender.get_bot_sender(),
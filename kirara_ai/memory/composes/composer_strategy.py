@@ -1,5 +1,7 @@
+import re
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional, Type
+from functools import cached_property
+from typing import Any, Dict, List, Optional, Type
 
 import kirara_ai.llm.format.tool as tools
 from kirara_ai.im.message import IMMessage, MediaMessage, TextMessage
@@ -10,11 +12,18 @@ from kirara_ai.media.manager import MediaManager
 
 from .xml_helper import XMLHelper
 
+# 只匹配位于文本开头的思考部分
+_THINK_RE = re.compile(r"^<think>.*?</think>", re.DOTALL)
+# 不经过回答缓冲、直接写入结果的内容类型
+_TOOL_CONTENT_TYPES = frozenset({LLMToolCallContent, LLMToolResultContent})
+
 
 def drop_think_part(text: str) -> str:
     """移除思考部分的文本"""
-    import re
-    return re.sub(r"(?:<think>[\s\S]*?</think>)?([\s\S]*)", r"\1", text, flags=re.DOTALL)
+    # 绝大多数文本不以思考部分开头，直接返回可以省去正则匹配
+    if not text.startswith("<think>"):
+        return text
+    return _THINK_RE.sub("", text, count=1)
 
 
 class MessageProcessor(ABC):
@@ -23,6 +32,11 @@ class MessageProcessor(ABC):
     def __init__(self, container: DependencyContainer):
         self.container = container
 
+    @cached_property
+    def media_manager(self) -> MediaManager:
+        """媒体管理器，首次使用时从容器中获取，之后直接复用"""
+        return self.container.resolve(MediaManager)
+
     @abstractmethod
     def process(self, message: Any, context: Dict) -> str:
         """处理特定类型的消息，返回组合后的文本"""
@@ -61,8 +75,7 @@ class LLMChatImageContentProcessor(MessageProcessor):
         media_ids = context.setdefault("media_ids", [])
         media_ids.append(content.media_id)
 
-        media_manager = self.container.resolve(MediaManager)
-        media = media_manager.get_media(content.media_id)
+        media = self.media_manager.get_media(content.media_id)
         desc = (media.description or "") if media else ""
 
         tag = XMLHelper.create_xml_tag("media_msg", {"id": content.media_id, "desc": desc})
@@ -130,17 +143,17 @@ class IMMessageProcessor(MessageProcessor):
         }
 
     def process(self, message: IMMessage, context: Dict) -> str:
-        result = f"{message.sender.display_name} 说: \n"
+        parts = [f"{message.sender.display_name} 说: \n"]
 
         for element in message.message_elements:
             for process_type, processor in self.element_processors.items():
                 if isinstance(element, process_type):
-                    result += processor.process(element, context)
+                    parts.append(processor.process(element, context))
                     break
                 else:
-                    result += f"{element.to_plain()}\n"
+                    parts.append(f"{element.to_plain()}\n")
 
-        return result
+        return "".join(parts)
 
 
 class LLMChatMessageProcessor(MessageProcessor):
@@ -156,24 +169,29 @@ class LLMChatMessageProcessor(MessageProcessor):
         }
 
     def process(self, message: LLMChatMessage, context: Dict) -> str:
-        result = ""
-        temp = ""
+        result: List[str] = []
+        temp: List[str] = []
 
         for part in message.content:
             part_type = type(part)
-            for processor_type, processor in self.content_processors.items():
-                if issubclass(part_type, processor_type):
-                    if part_type in [LLMToolCallContent, LLMToolResultContent]:
-                            # 工具调用和结果直接添加到结果中，不经过temp
-                        result += processor.process(part, context)
-                    else:
-                        # 其他内容添加到temp中
-                        temp += processor.process(part, context)
-
-        if temp.strip("\n"):
-            result += f"你回答: \n{temp}"
-
-        return result
+            processor = self.content_processors.get(part_type)
+            if processor is None:
+                # 子类无法直接命中，退回按继承关系查找
+                processor = next((p for t, p in self.content_processors.items() if issubclass(part_type, t)), None)
+                if processor is None:
+                    continue
+            if part_type in _TOOL_CONTENT_TYPES:
+                # 工具调用和结果直接添加到结果中，不经过temp
+                result.append(processor.process(part, context))
+            else:
+                # 其他内容添加到temp中
+                temp.append(processor.process(part, context))
+
+        answer = "".join(temp)
+        if answer.strip("\n"):
+            result.append(f"你回答: \n{answer}")
+
+        return "".join(result)
 
 
 class ProcessorFactory:
@@ -96,12 +96,13 @@ class MediaContentStrategy:
     def extract_content(self, content: str, entry: MemoryEntry) -> List[ContentInfo]:
         media_parts = []
         media_tags = XMLHelper.parse_xml_tag(content, "media_msg")
+        known_media_ids = set(entry.metadata.get("_media_ids", ()))
         
         for attrs, start, end in media_tags:
             if "id" in attrs and attrs["id"] is not None:
                 media_id = attrs["id"]
                 # 检查媒体ID是否在元数据中
-                if "_media_ids" in entry.metadata and media_id in entry.metadata["_media_ids"]:
+                if media_id in known_media_ids:
                     media_parts.append(ContentInfo(
                         content_type="media",
                         start=start,
@@ -129,27 +130,32 @@ class ToolCallContentStrategy:
         if "_tool_calls" not in entry.metadata:
             return []
         
-        tool_calls = [call for call in entry.metadata["_tool_calls"]]
+        # 按 ID 索引工具调用数据，同一 ID 出现多次时以第一个为准
+        tool_calls: Dict[Any, Dict[str, Any]] = {}
+        for call in entry.metadata["_tool_calls"]:
+            tool_calls.setdefault(call.get("id"), call)
         
         for attrs, start, end in tool_call_tags:
             if "id" in attrs and attrs["id"] is not None:
-                call_id = attrs["id"]
                 # 查找对应的工具调用数据
-                for call in tool_calls:
-                    if call.get("id") == call_id:
-                        tool_call_parts.append(ContentInfo(
-                            content_type="tool_call",
-                            start=start,
-                            end=end,
-                            text=content[start:end],
-                            metadata=call
-                        ))
-                        break
+                call = tool_calls.get(attrs["id"])
+                if call is not None:
+                    tool_call_parts.append(ContentInfo(
+                        content_type="tool_call",
+                        start=start,
+                        end=end,
+                        text=content[start:end],
+                        metadata=call
+                    ))
         
         return tool_call_parts
     
     def to_llm_content(self, info: ContentInfo) -> LLMChatContentPartType:
-        return LLMToolCallContent.model_validate(info.metadata)
+        # 元数据由 LLMToolCallContent.model_dump 生成，字段均为基本类型，可以跳过校验直接构造；
+        # parameters 仍为字符串时需要经过校验器解析
+        if isinstance(info.metadata.get("parameters"), str):
+            return LLMToolCallContent.model_validate(info.metadata)
+        return LLMToolCallContent.model_construct(**info.metadata)
     
     def to_text(self, info: ContentInfo) -> str:
         return f"<function_call id=\"{info.metadata['id']}\" name=\"{info.metadata['name']}\" />"
@@ -165,22 +171,23 @@ class ToolResultContentStrategy:
         if "_tool_results" not in entry.metadata:
             return []
         
-        tool_results = [result for result in entry.metadata["_tool_results"]]
+        # 按 ID 索引工具结果数据，同一 ID 出现多次时以第一个为准
+        tool_results: Dict[Any, Dict[str, Any]] = {}
+        for result in entry.metadata["_tool_results"]:
+            tool_results.setdefault(result.get("id"), result)
         
         for attrs, start, end in tool_result_tags:
             if "id" in attrs and attrs["id"] is not None:
-                result_id = attrs["id"]
                 # 查找对应的工具结果数据
-                for result in tool_results:
-                    if result.get("id") == result_id:
-                        tool_result_parts.append(ContentInfo(
-                            content_type="tool_result",
-                            start=start,
-                            end=end,
-                            text=content[start:end],
-                            metadata=result
-                        ))
-                        break
+                result = tool_results.get(attrs["id"])
+                if result is not None:
+                    tool_result_parts.append(ContentInfo(
+                        content_type="tool_result",
+                        start=start,
+                        end=end,
+                        text=content[start:end],
+                        metadata=result
+                    ))
         
         return tool_result_parts
     
@@ -231,32 +238,26 @@ class ContentParser:
             if info.content_type == "tool_call":
                 # 如果之前有普通内容，先创建一个消息
                 if current_content:
-                    messages.append(LLMChatMessage(role=current_role, content=current_content))
+                    messages.append(LLMChatMessage.build(current_role, current_content))
                     current_content = []
                 
                 # 创建工具调用消息
-                messages.append(LLMChatMessage(
-                    role="assistant", 
-                    content=[strategy.to_llm_content(info)]
-                ))
+                messages.append(LLMChatMessage.build("assistant", [strategy.to_llm_content(info)]))
             elif info.content_type == "tool_result":
                 # 如果之前有普通内容，先创建一个消息
                 if current_content:
-                    messages.append(LLMChatMessage(role=current_role, content=current_content))
+                    messages.append(LLMChatMessage.build(current_role, current_content))
                     current_content = []
                 
                 # 创建工具结果消息
-                messages.append(LLMChatMessage(
-                    role="tool", 
-                    content=[strategy.to_llm_content(info)]
-                ))
+                messages.append(LLMChatMessage.build("tool", [strategy.to_llm_content(info)]))
             else:
                 # 普通内容就近拼接
                 current_content.append(strategy.to_llm_content(info))
         
         # 处理剩余的普通内容
         if current_content:
-            messages.append(LLMChatMessage(role=current_role, content=current_content))
+            messages.append(LLMChatMessage.build(current_role, current_content))
         
         return messages
     
@@ -283,21 +284,22 @@ class DefaultDecomposerStrategy:
         # 限制最近的条目数量
         entries = entries[-10:]
         
+        # 所有条目的相对时间以同一时刻为准
+        now = datetime.now()
         result: List[ComposableMessageType] = []
         for entry in entries:
-            time_diff = datetime.now() - entry.timestamp
-            time_str = self._get_time_str(time_diff)
+            time_str = self._get_time_str(now - entry.timestamp)
             
             # 解析记忆条目
             content = entry.content or ""
             message_parts = []
             
             if content:
-                if "你回答:" in content:
+                user_content, separator, assistant_content = content.partition("你回答:")
+                if separator:
                     # 包含用户消息和AI回答
-                    parts = content.split("你回答:", 1)
-                    user_content = parts[0].strip()
-                    assistant_content = parts[1].strip() if len(parts) > 1 else None
+                    user_content = user_content.strip()
+                    assistant_content = assistant_content.strip()
                     
                     # 处理用户消息
                     if user_content:
@@ -358,11 +360,11 @@ class MultiElementDecomposerStrategy:
         if not content:
             return result
             
-        if "你回答:" in content:
+        user_content, separator, assistant_content = content.partition("你回答:")
+        if separator:
             # 包含用户消息和AI回答
-            parts = content.split("你回答:", 1)
-            user_content = parts[0].strip()
-            assistant_content = parts[1].strip() if len(parts) > 1 else None
+            user_content = user_content.strip()
+            assistant_content = assistant_content.strip()
             
             # 处理用户消息
             if user_content:
@@ -391,16 +393,11 @@ class MultiElementDecomposerStrategy:
         合并相邻的相同角色消息
         只处理 user 和 assistant 类型， 其他类型不处理
         """
-        i = 0
-        while i < len(messages) - 1:
-            current_msg = messages[i]
-            next_msg = messages[i + 1]
-            
-            if (current_msg.role == next_msg.role and 
-                current_msg.role in ["user", "assistant"]):
-                # 合并内容
-                current_msg.content.extend(next_msg.content)
-                # 删除下一个消息
-                messages.pop(i + 1)
+        # 单次遍历重建列表，避免逐个 pop 带来的元素搬移
+        merged: List[LLMChatMessage] = []
+        for msg in messages:
+            if merged and merged[-1].role == msg.role and msg.role in ("user", "assistant"):
+                merged[-1].content.extend(msg.content)
             else:
-                i += 1
\ No newline at end of file
+                merged.append(msg)
+        messages[:] = merged
\ No newline at end of file
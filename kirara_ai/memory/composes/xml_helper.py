@@ -1,5 +1,14 @@
 import re
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Pattern, Tuple
+
+_ATTR_RE = re.compile(r'(\w+)="(.*?)"')
+
+
+@lru_cache(maxsize=None)
+def _tag_pattern(tag_name: str) -> Pattern[str]:
+    """获取匹配指定自闭合标签的正则，标签名种类很少，编译结果全部缓存"""
+    return re.compile(f'<{re.escape(tag_name)}\\s+(.*?)\\s*/>')
 
 
 class XMLHelper:
@@ -31,13 +40,10 @@ class XMLHelper:
         """解析XML标签，返回属性字典和标签在原文中的起始、结束位置
         如果属性在标签中不存在，则在返回的字典中该属性值为 None
         """
-        pattern = re.compile(f'<{tag_name}\\s+(.*?)\\s*/>')
-        attr_pattern = re.compile(r'(\w+)="(.*?)"')
-        
         results: List[Tuple[Dict[str, Optional[str]], int, int]] = []
-        for match in pattern.finditer(content):
+        for match in _tag_pattern(tag_name).finditer(content):
             attrs_text = match.group(1)
-            attrs: Dict[str, Optional[str]] = {name: XMLHelper.unescape_xml_attr(value) for name, value in attr_pattern.findall(attrs_text)}
+            attrs: Dict[str, Optional[str]] = {name: XMLHelper.unescape_xml_attr(value) for name, value in _ATTR_RE.findall(attrs_text)}
             results.append((attrs, match.start(), match.end()))
         
         return results
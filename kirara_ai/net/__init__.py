@@ -0,0 +1,3 @@
+from .http import client_session, close_shared_session, get_shared_session
+
+__all__ = ["client_session", "close_shared_session", "get_shared_session"]
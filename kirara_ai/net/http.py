@@ -0,0 +1,54 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import aiohttp
+
+# 共享会话的默认超时，需要更长时间的请求（如下载大文件）可以在单次请求中覆盖
+DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=30)
+
+_shared_session: Optional[aiohttp.ClientSession] = None
+_shared_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _create_session() -> aiohttp.ClientSession:
+    connector = aiohttp.TCPConnector(limit=100, limit_per_host=16, ttl_dns_cache=300, keepalive_timeout=60)
+    return aiohttp.ClientSession(connector=connector, timeout=DEFAULT_TIMEOUT, trust_env=True)
+
+
+def get_shared_session() -> aiohttp.ClientSession:
+    """
+    获取进程内共享的 HTTP 会话，复用连接池以省去重复的 TCP/TLS 握手。
+    会话绑定在首次调用时正在运行的事件循环上，应当在应用主循环中调用。
+    """
+    global _shared_session, _shared_loop
+    loop = asyncio.get_running_loop()
+    if _shared_session is None or _shared_session.closed:
+        _shared_session = _create_session()
+        _shared_loop = loop
+    elif _shared_loop is not loop:
+        raise RuntimeError("The shared HTTP session is bound to a different event loop")
+    return _shared_session
+
+
+@asynccontextmanager
+async def client_session() -> AsyncIterator[aiohttp.ClientSession]:
+    """
+    获取可用于当前事件循环的 HTTP 会话。
+    在共享会话所在的事件循环中直接复用共享会话；
+    在其他事件循环中（例如工作线程里通过 asyncio.run 创建的临时循环）则使用用完即关闭的临时会话。
+    """
+    if _shared_session is not None and not _shared_session.closed and _shared_loop is asyncio.get_running_loop():
+        yield _shared_session
+        return
+    async with _create_session() as session:
+        yield session
+
+
+async def close_shared_session():
+    """关闭共享的 HTTP 会话"""
+    global _shared_session, _shared_loop
+    if _shared_session is not None and not _shared_session.closed:
+        await _shared_session.close()
+    _shared_session = None
+    _shared_loop = None
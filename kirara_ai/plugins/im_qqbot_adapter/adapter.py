@@ -2,7 +2,7 @@ import asyncio
 import base64
 import functools
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type
 
 import ymbotpy as botpy
 import ymbotpy.message
@@ -11,8 +11,8 @@ from ymbotpy.http import Route as BotpyRoute
 from ymbotpy.types.message import Media as BotpyMedia
 
 from kirara_ai.im.adapter import BotProfileAdapter, IMAdapter
-from kirara_ai.im.message import (ImageMessage, IMMessage, MentionElement, MessageElement, TextMessage, VideoElement,
-                                  VoiceMessage)
+from kirara_ai.im.message import (ImageMessage, IMMessage, MediaMessage, MentionElement, MessageElement, TextMessage,
+                                  VideoElement, VoiceMessage)
 from kirara_ai.im.profile import UserProfile
 from kirara_ai.im.sender import ChatSender, ChatType
 from kirara_ai.logger import get_logger
@@ -121,21 +121,20 @@ class QQBotAdapter(botpy.WebHookClient, IMAdapter, BotProfileAdapter):
         elements: List[MessageElement] = []
         if raw_message.content.strip():
             elements.append(TextMessage(text=raw_message.content.lstrip()))
+        # 附件统一收集后批量注册
+        media_items: List[Tuple[Type[MediaMessage], Dict[str, Any]]] = []
         for attachment in raw_message.attachments:
             if attachment.content_type.startswith('image/'):
-                elements.append(
-                    ImageMessage(
-                        url=attachment.url,
-                        format=attachment.content_type.removeprefix('image/')
-                    )
-                )
+                media_items.append((ImageMessage, {
+                    "url": attachment.url,
+                    "format": attachment.content_type.removeprefix('image/'),
+                }))
             elif attachment.content_type.startswith('audio'):
-                elements.append(
-                    VoiceMessage(
-                        url=attachment.url,
-                        format=attachment.filename.split('.')[-1]
-                    )
-                )
+                media_items.append((VoiceMessage, {
+                    "url": attachment.url,
+                    "format": attachment.filename.split('.')[-1],
+                }))
+        elements.extend(MediaMessage.create_many(media_items))
         return IMMessage(sender=sender, message_elements=elements, raw_message=raw_dict)
 
     async def send_message(self, message: IMMessage, recipient: ChatSender):
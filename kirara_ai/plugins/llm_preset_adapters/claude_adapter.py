@@ -1,6 +1,6 @@
 import asyncio
 import base64
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 import aiohttp
 import requests
@@ -14,9 +14,19 @@ from kirara_ai.llm.format.request import LLMChatRequest, Tool
 from kirara_ai.llm.format.response import LLMChatResponse, Message, Usage
 from kirara_ai.logger import get_logger
 from kirara_ai.media.manager import MediaManager
+from kirara_ai.media.media_object import Media
 from kirara_ai.tracing.decorator import trace_llm_chat
 
-from .utils import generate_tool_call_id, pick_tool_calls
+from .utils import RequestFieldMapping, generate_tool_call_id, pick_request_fields, pick_tool_calls
+
+# 直接从 LLMChatRequest 透传的字段
+CLAUDE_CHAT_FIELDS: RequestFieldMapping = (
+    ("model", "model"),
+    ("max_tokens", "max_tokens"),
+    ("temperature", "temperature"),
+    ("top_p", "top_p"),
+    ("stream", "stream"),
+)
 
 
 class ClaudeConfig(BaseModel):
@@ -27,6 +37,8 @@ class ClaudeConfig(BaseModel):
 
 async def convert_llm_chat_message_to_claude_message(messages: list[LLMChatMessage], media_manager: MediaManager) -> list[dict]:
     content: List[Dict[str, Any]] = []
+    # 图片的 base64 编码需要读取文件，先记录下来，最后并发编码后再填入
+    pending_images: List[Tuple[Dict[str, Any], Media]] = []
     for msg in [msg for msg in messages if msg.role in ["user", "assistant", "tool"]]:
         parts: List[Dict[str, Any]] = []
         for part in msg.content:
@@ -40,11 +52,17 @@ async def convert_llm_chat_message_to_claude_message(messages: list[LLMChatMessa
                 media = media_manager.get_media(part.media_id)
                 if media is None:
                     raise ValueError(f"Media {part.media_id} not found")
-                parts.append({"source": {"media_type": str(media.mime_type), "data": await media.get_base64()}, "type": "image"})
+                source = {"media_type": str(media.mime_type)}
+                pending_images.append((source, media))
+                parts.append({"source": source, "type": "image"})
         content.append({
             "role": "user" if msg.role == "tool" else msg.role,
             "content": parts
         })
+    if pending_images:
+        encoded = await asyncio.gather(*(media.get_base64() for _, media in pending_images))
+        for (source, _), data in zip(pending_images, encoded):
+            source["data"] = data
     return content
 
 def convert_tools_to_claude_format(tools: list[Tool]) -> list[dict]:
@@ -95,41 +113,36 @@ class ClaudeAdapter(LLMBackendAdapter, AutoDetectModelsProtocol, LLMChatProtocol
 
         # 构建请求数据
 
-        data = {
-            "model": req.model,
-            "messages": asyncio.run(convert_llm_chat_message_to_claude_message(req.messages, self.media_manager)),
-            "max_tokens": req.max_tokens,
-            "system": system_message,
-            "temperature": req.temperature,
-            "top_p": req.top_p,
-            "stream": req.stream,
+        data = pick_request_fields(req, CLAUDE_CHAT_FIELDS)
+        data["messages"] = asyncio.run(convert_llm_chat_message_to_claude_message(req.messages, self.media_manager))
+        if system_message is not None:
+            data["system"] = system_message
+        if req.tools:
             # claude tools格式中参数部分命名与openai api不同，不能简单使用model_dumps，在这里进行转换
-            "tools": convert_tools_to_claude_format(req.tools) if req.tools else None,
+            data["tools"] = convert_tools_to_claude_format(req.tools)
             # claude默认如果使用了tools字段，这里需要指定tool_choice， claude默认为{"type": "auto"}.
             # 可考虑后续给用户暴露此接口， 目前此处各模型定义不太统一
-            "tool_choice": {"type": "auto"} if req.tools else None,
-        }
-        # Remove None fields
-        data = {k: v for k, v in data.items() if v is not None}
+            data["tool_choice"] = {"type": "auto"}
 
-        response = requests.post(api_url, json=data, headers=headers)
+        response = requests.post(api_url, data=tools.json_dumps(data), headers=headers)
         try:
             response.raise_for_status()
-            response_data = response.json()
+            response_data = tools.json_loads(response.content)
         except Exception as e:
             self.logger.error(f"API Response: {response.text}")
             raise e
 
         content: List[LLMChatContentPartType] = []
 
+        # 响应中的图片在同一个事件循环中并发注册，避免每张图片都创建一次事件循环
+        image_sources = [res["source"] for res in response_data["content"] if res["type"] == "image"]
+        media_ids = iter(asyncio.run(self._register_response_images(image_sources)) if image_sources else [])
+
         for res in response_data["content"]:
             if res["type"] == "text":
                 content.append(LLMChatTextContent(text=res["text"]))
             elif res["type"] == "image":
-                image_data = base64.b64decode(res["source"]["data"])
-                media = asyncio.run(self.media_manager.register_from_data(
-                    image_data, res["source"]["media_type"], source="claude response"))
-                content.append(LLMChatImageContent(media_id=media))
+                content.append(LLMChatImageContent(media_id=next(media_ids)))
             elif res["type"] == "tool_use":
                 # tool_call 时 只会额外返回一个 text 的深度思考。
                 content.append(LLMToolCallContent(id=res.get("id", generate_tool_call_id(res["name"])), name=res["name"], parameters=res.get("input", None)))
@@ -137,14 +150,14 @@ class ClaudeAdapter(LLMBackendAdapter, AutoDetectModelsProtocol, LLMChatProtocol
         input_tokens = usage_data.get("input_tokens", 0)
         output_tokens = usage_data.get("output_tokens", 0)
 
-        return LLMChatResponse(
+        return LLMChatResponse.build(
             model=req.model,
             usage=Usage(
                 prompt_tokens=input_tokens,
                 completion_tokens=output_tokens,
                 total_tokens=input_tokens + output_tokens,
             ),
-            message=Message(
+            message=Message.build(
                 content=content,
                 role=response_data.get("role", "assistant"),
                 finish_reason=response_data.get("stop_reason", "stop"),
@@ -153,6 +166,13 @@ class ClaudeAdapter(LLMBackendAdapter, AutoDetectModelsProtocol, LLMChatProtocol
             )
         )
 
+    async def _register_response_images(self, sources: List[Dict[str, Any]]) -> List[str]:
+        return await asyncio.gather(*(
+            self.media_manager.register_from_data(
+                base64.b64decode(source["data"]), source["media_type"], source="claude response")
+            for source in sources
+        ))
+
     async def auto_detect_models(self) -> list[str]:
         # {
         #   "data": [
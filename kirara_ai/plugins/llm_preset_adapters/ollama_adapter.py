@@ -19,7 +19,15 @@ from kirara_ai.media.manager import MediaManager
 from kirara_ai.tracing import trace_llm_chat
 
 from .openai_adapter import convert_tools_to_openai_format
-from .utils import generate_tool_call_id, pick_tool_calls
+from .utils import RequestFieldMapping, generate_tool_call_id, pick_request_fields, pick_tool_calls
+
+# 从 LLMChatRequest 透传到 options 中的字段
+OLLAMA_OPTION_FIELDS: RequestFieldMapping = (
+    ("temperature", "temperature"),
+    ("top_p", "top_p"),
+    ("num_predict", "max_tokens"),
+    ("stop", "stop"),
+)
 
 
 class OllamaConfig(BaseModel):
@@ -123,38 +131,29 @@ class OllamaAdapter(LLMBackendAdapter, AutoDetectModelsProtocol, LLMChatProtocol
                 messages.append(convert_non_tool_message(
                     msg, self.media_manager, loop))
 
-        data = {
-            "model": req.model,
+        options = pick_request_fields(req, OLLAMA_OPTION_FIELDS)
+        if req.tools:
+            options["tools"] = convert_tools_to_ollama_format(req.tools)
+        data: dict[str, Any] = {
             "messages": messages,
             "stream": False,
-            "options": {
-                "temperature": req.temperature,
-                "top_p": req.top_p,
-                "num_predict": req.max_tokens,
-                "stop": req.stop,
-                "tools": convert_tools_to_ollama_format(req.tools) if req.tools else None,
-            },
+            "options": options,
         }
+        if req.model is not None:
+            data["model"] = req.model
 
-        # Remove None fields
-        data = {k: v for k, v in data.items() if v is not None}
-        if "options" in data:
-            data["options"] = {
-                k: v for k, v in data["options"].items() if v is not None # type: ignore
-            }
-
-        response = requests.post(api_url, json=data, headers=headers)
+        response = requests.post(api_url, data=tools.json_dumps(data), headers=headers)
         try:
             response.raise_for_status()
-            response_data = response.json()
+            response_data = tools.json_loads(response.content)
         except Exception as e:
             self.logger.error(f"API Response: {response.text}")
             raise e
         # https://github.com/ollama/ollama/blob/main/docs/api.md#generate-a-chat-completion
         content = convert_llm_response(response_data)
-        return LLMChatResponse(
+        return LLMChatResponse.build(
             model=req.model,
-            message=Message(
+            message=Message.build(
                 content=content,
                 role="assistant",
                 finish_reason="stop",
@@ -18,7 +18,23 @@ from kirara_ai.logger import get_logger
 from kirara_ai.media import MediaManager
 from kirara_ai.tracing import trace_llm_chat
 
-from .utils import guess_openai_model, pick_tool_calls
+from .utils import RequestFieldMapping, guess_openai_model, pick_request_fields, pick_tool_calls
+
+# 直接从 LLMChatRequest 透传的字段
+OPENAI_CHAT_FIELDS: RequestFieldMapping = (
+    ("model", "model"),
+    ("frequency_penalty", "frequency_penalty"),
+    ("max_completion_tokens", "max_tokens"),  # 最新的reference废除max_tokens，改为如上参数
+    ("presence_penalty", "presence_penalty"),
+    ("response_format", "response_format"),
+    ("stop", "stop"),
+    ("stream", "stream"),
+    ("stream_options", "stream_options"),
+    ("temperature", "temperature"),
+    ("top_p", "top_p"),
+    ("logprobs", "logprobs"),
+    ("top_logprobs", "top_logprobs"),
+)
 
 logger = get_logger("OpenAIAdapter")
 
@@ -117,34 +133,19 @@ class OpenAIAdapterChatBase(LLMBackendAdapter, AutoDetectModelsProtocol, LLMChat
             "Content-Type": "application/json",
         }
         
-        data = {
-            "messages": asyncio.run(convert_llm_chat_message_to_openai_message(req.messages, self.media_manager)),
-            "model": req.model,
-            "frequency_penalty": req.frequency_penalty,
-            "max_completion_tokens": req.max_tokens, # 最新的reference废除max_tokens，改为如上参数
-            "presence_penalty": req.presence_penalty,
-            "response_format": req.response_format,
-            "stop": req.stop,
-            "stream": req.stream,
-            "stream_options": req.stream_options,
-            "temperature": req.temperature,
-            "top_p": req.top_p,
+        data = pick_request_fields(req, OPENAI_CHAT_FIELDS)
+        data["messages"] = asyncio.run(convert_llm_chat_message_to_openai_message(req.messages, self.media_manager))
+        if req.tools:
             # tool pydantic 模型按照 openai api 格式进行的建立。所以这里直接dump
-            "tools": convert_tools_to_openai_format(req.tools) if req.tools else None,
-            "tool_choice": "auto" if req.tools else None,
-            "logprobs": req.logprobs,
-            "top_logprobs": req.top_logprobs,
-        }
-
-        # Remove None fields
-        data = {k: v for k, v in data.items() if v is not None}
+            data["tools"] = convert_tools_to_openai_format(req.tools)
+            data["tool_choice"] = "auto"
         
         logger.debug(f"Request: {data}")
 
-        response = requests.post(api_url, json=data, headers=headers)
+        response = requests.post(api_url, data=tools.json_dumps(data), headers=headers)
         try:
             response.raise_for_status()
-            response_data: dict = response.json()
+            response_data: dict = tools.json_loads(response.content)
         except Exception as e:
             logger.error(f"Response: {response.text}")
             raise e
@@ -167,14 +168,14 @@ class OpenAIAdapterChatBase(LLMBackendAdapter, AutoDetectModelsProtocol, LLMChat
 
         usage_data = response_data.get("usage", {})
         
-        return LLMChatResponse(
+        return LLMChatResponse.build(
             model=req.model,
             usage=Usage(
                 prompt_tokens=usage_data.get("prompt_tokens", 0),
                 completion_tokens=usage_data.get("completion_tokens", 0),
                 total_tokens=usage_data.get("total_tokens", 0),
             ),
-            message=Message(
+            message=Message.build(
                 content=content,
                 role=message.get("role", "assistant"),
                 tool_calls = pick_tool_calls(content),
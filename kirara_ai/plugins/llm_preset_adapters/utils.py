@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional, Tuple
+from typing import Any, Dict, Optional, Tuple
 
 from kirara_ai.llm.format.message import LLMChatContentPartType, LLMToolCallContent
 from kirara_ai.llm.format.tool import Function, ToolCall
@@ -9,6 +9,21 @@ from kirara_ai.llm.model_types import AudioModelAbility, EmbeddingModelAbility,
 def generate_tool_call_id(name: str) -> str:
     return f"{name}_{str(uuid.uuid4())}"
 
+# 请求字段映射：(接口字段名, LLMChatRequest 属性名)
+RequestFieldMapping = Tuple[Tuple[str, str], ...]
+
+def pick_request_fields(req: Any, fields: RequestFieldMapping) -> Dict[str, Any]:
+    """
+    按适配器预先定义的字段映射，从请求中取出不为 None 的字段。
+    大部分字段在一次请求中都是 None，只读取接口支持的字段，不必先构造完整的字典再过滤。
+    """
+    data: Dict[str, Any] = {}
+    for key, attr in fields:
+        value = getattr(req, attr)
+        if value is not None:
+            data[key] = value
+    return data
+
 def pick_tool_calls(calls: list[LLMChatContentPartType]) -> Optional[list[ToolCall]]:
     tool_calls = [
         ToolCall(
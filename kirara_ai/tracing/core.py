@@ -6,7 +6,8 @@ from typing import Any, Dict, Generic, List, Optional, Tuple, Type, TypeVar
 
 from sqlalchemy import Column, DateTime, String, asc
 
-from kirara_ai.database import Base, DatabaseManager
+from kirara_ai.database import DatabaseManager
+from kirara_ai.database.base import Base
 from kirara_ai.events.event_bus import EventBus
 from kirara_ai.events.tracing import TraceEvent
 from kirara_ai.ioc.container import DependencyContainer
@@ -103,21 +103,14 @@ async def list_media():
     
     # 如果有指定标签，继续筛选
     if search_params.tags and len(search_params.tags) > 0:
-        filtered_ids = []
-        for media_id in all_media_ids:
-            metadata = manager.get_metadata(media_id)
-            if metadata and any(tag in metadata.tags for tag in search_params.tags):
-                filtered_ids.append(media_id)
-        all_media_ids = filtered_ids
+        tagged_ids = set(manager.search_by_tags(search_params.tags))
+        all_media_ids = [media_id for media_id in all_media_ids if media_id in tagged_ids]
     
     # 如果有搜索关键词，继续筛选
     if search_params.query:
-        description_ids = manager.search_by_description(search_params.query)
-        source_ids = manager.search_by_source(search_params.query)
-        all_media_ids = [
-            media_id for media_id in all_media_ids
-            if media_id in description_ids or media_id in source_ids
-        ]
+        matched_ids = set(manager.search_by_description(search_params.query))
+        matched_ids.update(manager.search_by_source(search_params.query))
+        all_media_ids = [media_id for media_id in all_media_ids if media_id in matched_ids]
     
     # 如果有日期范围，继续筛选
     if search_params.start_date or search_params.end_date:
@@ -14,7 +14,7 @@ from quart import Blueprint, current_app, g, request, websocket
 from kirara_ai.config.config_loader import CONFIG_FILE, ConfigLoader
 from kirara_ai.config.global_config import GlobalConfig
 from kirara_ai.im.manager import IMManager
-from kirara_ai.internal import set_restart_flag, shutdown_event
+from kirara_ai.internal import set_restart_flag, set_timezone, shutdown_event
 from kirara_ai.llm.llm_manager import LLMManager
 from kirara_ai.logger import WebSocketLogHandler, get_logger
 from kirara_ai.plugin_manager.plugin_loader import PluginLoader
@@ -160,9 +160,8 @@ async def update_system_config():
         ConfigLoader.save_config_with_backup(CONFIG_FILE, config)
         
         # 如果时区变化，设置系统时区并调用 tzset
-        if timezone_changed and hasattr(time, "tzset"):
-            os.environ["TZ"] = config.system.timezone
-            time.tzset()
+        if timezone_changed:
+            set_timezone(config.system.timezone)
             
         return {"status": "success"}
     except Exception as e:
@@ -1,12 +1,16 @@
 import hashlib
+import json
 import os
 import subprocess
 import sys
+import time
 from functools import lru_cache
 
 import aiohttp
 import psutil
 
+from kirara_ai.net import client_session
+
 
 def get_installed_version() -> str:
     """获取当前安装的版本号"""
@@ -26,7 +30,7 @@ def get_installed_version() -> str:
 async def get_latest_pypi_version(package_name: str) -> tuple[str, str]:
     """获取包的最新版本和下载URL"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with client_session() as session:
             async with session.get(f"https://pypi.org/pypi/{package_name}/json") as response:
                 response.raise_for_status()
                 data = await response.json()
@@ -38,12 +42,35 @@ async def get_latest_pypi_version(package_name: str) -> tuple[str, str]:
         return latest_version, ""
     except Exception:
         return "0.0.0", ""
+
+
+async def get_latest_pypi_version_cached(package_name: str, cache_file: str, ttl: float) -> tuple[str, str]:
+    """获取包的最新版本和下载URL，结果在 ttl 秒内从本地缓存文件读取"""
+    try:
+        if time.time() - os.stat(cache_file).st_mtime < ttl:
+            with open(cache_file, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached["package"] == package_name:
+                return cached["version"], cached["url"]
+    except (OSError, ValueError, KeyError):
+        pass
+
+    latest_version, download_url = await get_latest_pypi_version(package_name)
+    if latest_version != "0.0.0":
+        try:
+            tmp_file = f"{cache_file}.tmp"
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump({"package": package_name, "version": latest_version, "url": download_url}, f)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+    return latest_version, download_url
     
 
 async def get_latest_npm_version(package_name: str, registry: str = "https://registry.npmjs.org") -> tuple[str, str]:
     """获取NPM包的最新版本和下载URL"""
     try:
-        async with aiohttp.ClientSession() as session:
+        async with client_session() as session:
             async with session.get(f"{registry}/{package_name}") as response:
                 response.raise_for_status()
                 data = await response.json()
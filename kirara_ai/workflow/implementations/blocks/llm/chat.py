@@ -115,14 +115,13 @@ class ChatMessageConstructor(Block):
             content.append(LLMChatImageContent(media_id=image.media_id))
 
         llm_msg = [
-            LLMChatMessage(role="system", content=[
-                           LLMChatTextContent(text=system_prompt)]),
+            LLMChatMessage.build("system", [LLMChatTextContent(text=system_prompt)]),
         ]
 
         if isinstance(memory_content, list) and all(isinstance(item, LLMChatMessage) for item in memory_content):
             llm_msg.extend(memory_content)  # type: ignore
 
-        llm_msg.append(LLMChatMessage(role="user", content=content))
+        llm_msg.append(LLMChatMessage.build("user", content))
         return {"llm_msg": llm_msg}
 
 
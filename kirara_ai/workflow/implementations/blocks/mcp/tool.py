@@ -6,7 +6,7 @@ from mcp import types
 from kirara_ai.ioc.container import DependencyContainer
 from kirara_ai.llm.format import tool
 from kirara_ai.llm.format.message import LLMToolResultContent
-from kirara_ai.llm.format.tool import CallableWrapper, Tool, ToolCall
+from kirara_ai.llm.format.tool import CallableWrapper, Tool, ToolCall, build_tool_input_schema
 from kirara_ai.logger import get_logger
 from kirara_ai.mcp_module.manager import MCPServerManager
 from kirara_ai.media.manager import MediaManager
@@ -69,7 +69,7 @@ class MCPToolProvider(Block):
                 built_tools.append(
                     Tool(
                         name=tool_name,
-                        parameters=tool_info.tool_info.inputSchema,
+                        parameters=build_tool_input_schema(tool_info.tool_info.inputSchema),
                         description=tool_info.tool_info.description or "",
                         invokeFunc=CallableWrapper(self._call_tool)
                     )
@@ -80,6 +80,21 @@ class MCPToolProvider(Block):
 
     async def _create_tool_result(self, tool_id: str, tool_name: str, content: list[types.TextContent | types.ImageContent | types.EmbeddedResource]) -> LLMToolResultContent:
         """创建工具调用结果"""
+        # 图片内容并发注册到媒体管理器
+        images = [item for item in content if isinstance(item, types.ImageContent)]
+        images_data = [b64decode(item.data) for item in images]
+        media_ids: List[str] = []
+        if images:
+            media_ids = await self.container.resolve(MediaManager).register_many([
+                {
+                    "data": data,
+                    "format": item.mimeType.split("/")[1],
+                    "media_type": MediaType.from_mime(item.mimeType),
+                }
+                for item, data in zip(images, images_data)
+            ])
+        registered_images = iter(zip(images_data, media_ids))
+
         converted_content: List[tool.TextContent | tool.MediaContent] = []
         for item in content:
             if isinstance(item, types.TextContent):
@@ -87,10 +102,7 @@ class MCPToolProvider(Block):
                     text=item.text
                 ))
             elif isinstance(item, types.ImageContent):
-                data = b64decode(item.data)
-                media_type = MediaType.from_mime(item.mimeType)
-                format = item.mimeType.split("/")[1]
-                media_id = await self.container.resolve(MediaManager).register_from_data(data, format=format, media_type=media_type)
+                data, media_id = next(registered_images)
                 converted_content.append(tool.MediaContent(
                     media_id=media_id,
                     mime_type=item.mimeType,
@@ -0,0 +1,91 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import MagicMock, patch
+
+import pytest
+from sqlalchemy import text
+
+from kirara_ai.database import DatabaseManager
+from kirara_ai.ioc.container import DependencyContainer
+
+
+# ==================== Fixtures ====================
+@pytest.fixture
+def test_dir():
+    temp_dir = tempfile.mkdtemp()
+    yield temp_dir
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def db_manager(test_dir):
+    container = DependencyContainer()
+    manager = DatabaseManager(container, database_url=f"sqlite:///{os.path.join(test_dir, 'test.db')}")
+    manager.initialize()
+    yield manager
+    manager.shutdown()
+
+
+# ==================== 测试用例 ====================
+@pytest.mark.asyncio
+async def test_async_session_shares_database(db_manager):
+    with db_manager.get_session() as session:
+        session.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        session.execute(text("INSERT INTO items (id) VALUES (1)"))
+        session.commit()
+
+    async with db_manager.get_async_session() as session:
+        result = await session.execute(text("SELECT COUNT(*) FROM items"))
+        assert result.scalar() == 1
+
+    assert db_manager.async_engine is not None
+    assert db_manager.async_engine.url.drivername == "sqlite+aiosqlite"
+
+
+def test_shutdown_releases_async_engine(db_manager):
+    db_manager.get_async_session()
+    db_manager.shutdown()
+    assert db_manager.async_engine is None
+    assert db_manager.async_session_factory is None
+
+
+def test_sqlite_pragmas_applied(db_manager):
+    with db_manager.get_session() as session:
+        assert session.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        # NORMAL = 1
+        assert session.execute(text("PRAGMA synchronous")).scalar() == 1
+
+
+@pytest.mark.asyncio
+async def test_sqlite_pragmas_applied_to_async_engine(db_manager):
+    async with db_manager.get_async_session() as session:
+        result = await session.execute(text("PRAGMA synchronous"))
+        assert result.scalar() == 1
+
+
+def test_initialize_warms_connection_pool(db_manager):
+    # initialize 结束后连接池中应已有一个可复用的连接
+    assert db_manager.engine.pool.checkedin() == 1
+
+
+def test_head_revision_cache_invalidated_by_script_edit(test_dir):
+    manager = DatabaseManager(DependencyContainer())
+    manager.data_dir = test_dir
+    versions_dir = os.path.join(test_dir, "versions")
+    os.makedirs(versions_dir)
+    script = os.path.join(versions_dir, "0001_init.py")
+    with open(script, "w") as f:
+        f.write("revision = 'a'\n")
+
+    with patch("kirara_ai.database.manager.ScriptDirectory") as script_directory:
+        script_directory.from_config.return_value.get_current_head.return_value = "a"
+        assert manager._get_head_revision(MagicMock(), versions_dir) == "a"
+        # 脚本不变时直接使用缓存
+        script_directory.from_config.return_value.get_current_head.return_value = "b"
+        assert manager._get_head_revision(MagicMock(), versions_dir) == "a"
+
+        # 原地修改脚本后需要重新解析
+        with open(script, "w") as f:
+            f.write("revision = 'b'  # edited\n")
+        assert manager._get_head_revision(MagicMock(), versions_dir) == "b"
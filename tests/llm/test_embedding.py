@@ -0,0 +1,39 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from kirara_ai.llm.format.embedding import FormatType, InputType, LLMEmbeddingRequest, OutputType
+from kirara_ai.llm.format.message import LLMChatImageContent, LLMChatTextContent
+
+
+# ==================== 测试用例 ====================
+def test_enum_fields_accept_strings():
+    req = LLMEmbeddingRequest(
+        inputs=[LLMChatTextContent(text="hello")],
+        model="test-model",
+        encoding_format="base64",
+        input_type="query",
+        output_type="int8",
+    )
+    assert req.encoding_format is FormatType.BASE64
+    assert req.input_type is InputType.QUERY
+    assert req.output_type == "int8"
+    # 写入请求体时仍是原始字符串
+    assert json.dumps({"output_type": req.output_type}) == '{"output_type": "int8"}'
+
+
+def test_enum_fields_reject_unknown_values():
+    with pytest.raises(ValidationError):
+        LLMEmbeddingRequest(inputs=[LLMChatTextContent(text="hello")], model="test-model", output_type="float64")
+
+
+def test_inputs_dispatched_by_type():
+    req = LLMEmbeddingRequest.model_validate({
+        "model": "test-model",
+        "inputs": [{"type": "text", "text": "hello"}, {"type": "image", "media_id": "media-1"}],
+    })
+    assert [type(item) for item in req.inputs] == [LLMChatTextContent, LLMChatImageContent]
+
+    with pytest.raises(ValidationError):
+        LLMEmbeddingRequest.model_validate({"model": "test-model", "inputs": [{"type": "video", "media_id": "x"}]})
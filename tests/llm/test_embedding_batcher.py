@@ -0,0 +1,112 @@
+import asyncio
+import threading
+from typing import List
+
+import pytest
+
+from kirara_ai.llm.embedding_batcher import AsyncDynamicEmbeddingBatcher
+from kirara_ai.llm.format.embedding import LLMEmbeddingRequest, LLMEmbeddingResponse
+from kirara_ai.llm.format.message import LLMChatTextContent
+from kirara_ai.llm.format.response import Usage
+
+
+class FakeEmbeddingAdapter:
+    """把每条文本输入转换为 [len(text)] 的向量，并记录收到的请求"""
+
+    def __init__(self, fail: bool = False):
+        self.requests: List[LLMEmbeddingRequest] = []
+        self.fail = fail
+        self.lock = threading.Lock()
+
+    def embed(self, req: LLMEmbeddingRequest) -> LLMEmbeddingResponse:
+        with self.lock:
+            self.requests.append(req)
+        if self.fail:
+            raise RuntimeError("backend error")
+        return LLMEmbeddingResponse(
+            vectors=[[float(len(item.text))] for item in req.inputs],
+            usage=Usage(total_tokens=len(req.inputs)),
+        )
+
+
+def make_request(*texts: str, model: str = "embed-model") -> LLMEmbeddingRequest:
+    return LLMEmbeddingRequest(inputs=[LLMChatTextContent(text=text) for text in texts], model=model)
+
+
+# ==================== 测试用例 ====================
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_merged():
+    adapter = FakeEmbeddingAdapter()
+    batcher = AsyncDynamicEmbeddingBatcher(adapter, batch_wait_timeout_s=0.05)
+    try:
+        responses = await asyncio.gather(
+            batcher.embed(make_request("a")),
+            batcher.embed(make_request("bb", "ccc")),
+            batcher.embed(make_request("dddd")),
+        )
+    finally:
+        await batcher.close()
+
+    assert len(adapter.requests) == 1
+    assert [r.vectors for r in responses] == [[[1.0]], [[2.0], [3.0]], [[4.0]]]
+    assert all(r.usage is None for r in responses)
+
+
+@pytest.mark.asyncio
+async def test_requests_with_different_params_are_not_merged():
+    adapter = FakeEmbeddingAdapter()
+    batcher = AsyncDynamicEmbeddingBatcher(adapter, batch_wait_timeout_s=0.05)
+    try:
+        first, second = await asyncio.gather(
+            batcher.embed(make_request("a", model="model-a")),
+            batcher.embed(make_request("bb", model="model-b")),
+        )
+    finally:
+        await batcher.close()
+
+    assert sorted(req.model for req in adapter.requests) == ["model-a", "model-b"]
+    # 单独发送的请求原样返回后端响应
+    assert first.vectors == [[1.0]] and first.usage is not None
+    assert second.vectors == [[2.0]]
+
+
+@pytest.mark.asyncio
+async def test_batches_respect_max_batch_size():
+    adapter = FakeEmbeddingAdapter()
+    batcher = AsyncDynamicEmbeddingBatcher(adapter, max_batch_size=2, batch_wait_timeout_s=0.05)
+    try:
+        responses = await asyncio.gather(*(batcher.embed(make_request("x" * i)) for i in range(1, 6)))
+    finally:
+        await batcher.close()
+
+    assert all(len(req.inputs) <= 2 for req in adapter.requests)
+    assert [r.vectors for r in responses] == [[[float(i)]] for i in range(1, 6)]
+
+
+@pytest.mark.asyncio
+async def test_backend_error_propagates_to_all_callers():
+    batcher = AsyncDynamicEmbeddingBatcher(FakeEmbeddingAdapter(fail=True), batch_wait_timeout_s=0.05)
+    try:
+        results = await asyncio.gather(
+            batcher.embed(make_request("a")),
+            batcher.embed(make_request("b")),
+            return_exceptions=True,
+        )
+    finally:
+        await batcher.close()
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+@pytest.mark.asyncio
+async def test_close_cancels_requests_in_wait_window():
+    adapter = FakeEmbeddingAdapter()
+    batcher = AsyncDynamicEmbeddingBatcher(adapter, batch_wait_timeout_s=1.0)
+    task = asyncio.create_task(batcher.embed(make_request("a")))
+    await asyncio.sleep(0.1)
+    await batcher.close()
+
+    # 已被取出但仍在等待窗口内的请求不能一直挂起
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(task, 1.0)
+    assert adapter.requests == []
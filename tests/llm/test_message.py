@@ -0,0 +1,34 @@
+import pytest
+
+from kirara_ai.llm.format.message import (LLM_CHAT_CONTENT_PART_TYPES, LLMChatImageContent, LLMChatMessage,
+                                          LLMChatTextContent, LLMToolCallContent)
+from kirara_ai.llm.format.tool import LLMToolResultContent, TextContent
+
+
+# ==================== 测试用例 ====================
+def test_build_matches_validated_message():
+    content = [LLMChatTextContent(text="hello"), LLMChatImageContent(media_id="media-1")]
+    built = LLMChatMessage.build("user", content)
+    assert built == LLMChatMessage(role="user", content=content)
+    assert built.model_dump() == LLMChatMessage(role="user", content=content).model_dump()
+
+
+def test_build_checks_content_type_by_role():
+    tool_result = LLMToolResultContent(id="call-1", name="tool", content=[TextContent(text="ok")])
+    assert LLMChatMessage.build("tool", [tool_result]).content == [tool_result]
+
+    with pytest.raises(ValueError):
+        LLMChatMessage.build("tool", [LLMChatTextContent(text="hello")])
+    with pytest.raises(ValueError):
+        LLMChatMessage.build("user", [tool_result])
+
+
+def test_tool_call_parameters_parsed_from_json_string():
+    content = LLMToolCallContent(id="call-1", name="tool", parameters='{"city": "Tokyo", "days": [1, 2]}')
+    assert content.parameters == {"city": "Tokyo", "days": [1, 2]}
+    assert LLMToolCallContent(id="call-1", name="tool", parameters={"a": 1}).parameters == {"a": 1}
+
+
+def test_content_part_types_tuple():
+    assert LLM_CHAT_CONTENT_PART_TYPES == (LLMChatTextContent, LLMChatImageContent, LLMToolCallContent, LLMToolResultContent)
+    assert isinstance(LLMChatTextContent(text="hello"), LLM_CHAT_CONTENT_PART_TYPES)
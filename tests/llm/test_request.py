@@ -0,0 +1,52 @@
+import pytest
+from pydantic import ValidationError
+
+from kirara_ai.llm.format.message import LLMChatMessage, LLMChatTextContent
+from kirara_ai.llm.format.request import LLMChatRequest
+from kirara_ai.llm.format.tool import CallableWrapper, Tool
+
+
+# ==================== 测试用例 ====================
+def test_sampling_params_accept_floats():
+    req = LLMChatRequest(temperature=0.7, top_p=1, frequency_penalty=-0.5, presence_penalty=1.5, max_tokens=256)
+    assert req.temperature == 0.7
+    assert req.top_p == 1.0
+    assert req.frequency_penalty == -0.5
+    assert req.max_tokens == 256
+
+
+@pytest.mark.parametrize("params", [
+    {"temperature": "0.7"},
+    {"temperature": 2.5},
+    {"top_p": 1.5},
+    {"frequency_penalty": -3},
+    {"max_tokens": 1.0},
+    {"max_tokens": 0},
+])
+def test_sampling_params_rejected(params):
+    with pytest.raises(ValidationError):
+        LLMChatRequest(**params)
+
+
+def test_validate_messages_from_raw():
+    messages = LLMChatRequest.validate_messages([
+        {"role": "user", "content": [{"type": "text", "text": "hello"}]},
+    ])
+    assert messages == [LLMChatMessage(role="user", content=[LLMChatTextContent(text="hello")])]
+
+    with pytest.raises(ValidationError):
+        LLMChatRequest.validate_messages([{"role": "user", "content": "hello"}])
+
+
+def test_validate_tools_from_raw():
+    async def invoke(tool_call):
+        return None
+
+    tools = LLMChatRequest.validate_tools([{
+        "name": "search",
+        "description": "search the web",
+        "parameters": {"properties": {"q": {"type": "string"}}, "required": ["q"]},
+        "invokeFunc": CallableWrapper(invoke),
+    }])
+    assert isinstance(tools[0], Tool)
+    assert tools[0].name == "search"
@@ -0,0 +1,34 @@
+import pytest
+
+from kirara_ai.llm.format.message import LLMChatTextContent
+from kirara_ai.llm.format.request import LLMChatRequest
+from kirara_ai.llm.format.response import LLMChatResponse, Message, Usage
+
+
+# ==================== 测试用例 ====================
+def test_build_matches_validated_response():
+    content = [LLMChatTextContent(text="hello")]
+    usage = Usage(prompt_tokens=1, completion_tokens=2, total_tokens=3)
+    built = LLMChatResponse.build(
+        model="test-model",
+        usage=usage,
+        message=Message.build(role="assistant", content=content, finish_reason="stop"),
+    )
+    validated = LLMChatResponse(
+        model="test-model",
+        usage=usage,
+        message=Message(role="assistant", content=content, finish_reason="stop"),
+    )
+    assert built == validated
+    assert built.model_dump() == validated.model_dump()
+
+
+def test_message_build_checks_role():
+    with pytest.raises(ValueError):
+        Message.build(role="robot", content=[LLMChatTextContent(text="hello")])  # type: ignore[arg-type]
+
+
+def test_request_messages_not_shared():
+    first = LLMChatRequest()
+    first.messages.append(Message.build(role="user", content=[LLMChatTextContent(text="hello")]))
+    assert LLMChatRequest().messages == []
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+from pydantic import ValidationError
+
+from kirara_ai.llm.format.request import ResponseFormat
+from kirara_ai.llm.format.tool import (CallableWrapper, Tool, ToolInputSchema, build_tool_input_schema, json_dumps,
+                                       json_loads)
+
+
+# ==================== 测试用例 ====================
+def test_json_dumps_round_trip():
+    data = {"model": "test", "messages": [{"role": "user", "content": "你好"}], "temperature": 0.5}
+    encoded = json_dumps(data)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == data
+    assert json_loads(encoded) == data
+
+
+def test_json_dumps_pydantic_model():
+    encoded = json_dumps({"response_format": ResponseFormat(type="json_object")})
+    assert json.loads(encoded) == {"response_format": {"type": "json_object"}}
+
+
+def test_build_tool_input_schema_is_cached():
+    schema = {"type": "object", "properties": {"q": {"type": "string"}}, "required": ["q"]}
+    first = build_tool_input_schema(schema)
+    assert isinstance(first, ToolInputSchema)
+    assert first.required == ["q"]
+    assert build_tool_input_schema(dict(schema)) is first
+
+    # 不符合 ToolInputSchema 的 schema 保留为字典
+    loose = build_tool_input_schema({"type": "object", "properties": {}})
+    assert loose == {"type": "object", "properties": {}}
+
+
+def test_tool_is_frozen_and_hashable():
+    async def invoke(tool_call):
+        return None
+
+    schema = build_tool_input_schema({"type": "object", "properties": {"q": {"type": "string"}}, "required": ["q"]})
+    wrapper = CallableWrapper(invoke)
+    tool = Tool(name="search", description="search the web", parameters=schema, invokeFunc=wrapper)
+    same = Tool(name="search", description="search the web", parameters=schema, invokeFunc=wrapper)
+
+    assert tool == same
+    assert hash(tool) == hash(same)
+    assert {tool: 1}[same] == 1
+    assert hash(Tool(name="raw", description="", parameters={"properties": {"a": {}}}, invokeFunc=wrapper))
+
+    with pytest.raises(ValidationError):
+        tool.name = "other"
+    with pytest.raises(ValidationError):
+        schema.required = []
+
+
+def test_non_dict_properties_fall_back_to_raw_schema():
+    async def invoke(tool_call):
+        return None
+
+    for properties in (None, ["q"]):
+        with pytest.raises(ValidationError):
+            ToolInputSchema(properties=properties, required=[])
+        schema = build_tool_input_schema({"type": "object", "properties": properties, "required": []})
+        assert isinstance(schema, dict)
+        tool = Tool(name="raw", description="", parameters=schema, invokeFunc=CallableWrapper(invoke))
+        assert isinstance(hash(tool), int)
@@ -43,6 +43,11 @@ class TestDropThinkPart:
         result = drop_think_part(text)
         assert result == text
 
+    def test_drop_think_part_only_leading(self):
+        text = "<think>思考\n多行</think>输出<think>保留</think>"
+        assert drop_think_part(text) == "输出<think>保留</think>"
+        assert drop_think_part("前缀<think>思考</think>") == "前缀<think>思考</think>"
+
 class TestTextMessageProcessor:
     def test_process(self, mock_container, sample_context):
         processor = TextMessageProcessor(mock_container)
@@ -159,6 +159,25 @@ class TestToolCallContentStrategy:
         assert content.id == "call1"
         assert content.name == "test_function"
 
+    def test_to_llm_content_parses_string_parameters(self):
+        strategy = ToolCallContentStrategy()
+        info = ContentInfo(
+            content_type="tool_call",
+            start=0,
+            end=10,
+            text="<function_call id=\"call1\" name=\"test_function\" />",
+            metadata={
+                "type": "tool_call",
+                "id": "call1",
+                "name": "test_function",
+                "parameters": '{"arg1": "value1"}'
+            }
+        )
+
+        content = strategy.to_llm_content(info)
+        assert isinstance(content, LLMToolCallContent)
+        assert content.parameters == {"arg1": "value1"}
+
     def test_to_text(self):
         strategy = ToolCallContentStrategy()
         info = ContentInfo(
@@ -0,0 +1,37 @@
+import asyncio
+
+import pytest
+
+from kirara_ai.net import client_session, close_shared_session, get_shared_session
+
+
+# ==================== 测试用例 ====================
+@pytest.mark.asyncio
+async def test_client_session_reuses_shared_session():
+    shared = get_shared_session()
+    try:
+        assert get_shared_session() is shared
+        async with client_session() as session:
+            assert session is shared
+        assert not shared.closed
+    finally:
+        await close_shared_session()
+    assert shared.closed
+
+
+@pytest.mark.asyncio
+async def test_client_session_in_other_loop_uses_temporary_session():
+    shared = get_shared_session()
+
+    async def use_session():
+        async with client_session() as session:
+            assert session is not shared
+            return session
+
+    try:
+        # 其他线程中的事件循环不能使用绑定在当前循环上的共享会话
+        temporary = await asyncio.to_thread(asyncio.run, use_session())
+        assert temporary.closed
+        assert not shared.closed
+    finally:
+        await close_shared_session()
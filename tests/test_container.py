@@ -0,0 +1,39 @@
+import pytest
+
+from kirara_ai.ioc.container import DependencyContainer
+
+
+# ==================== 测试用例 ====================
+def test_resolve_walks_parent_chain():
+    root = DependencyContainer()
+    root.register("root", 1)
+    with root.scoped() as scoped:
+        scoped.register("scoped", 2)
+        with scoped.scoped() as inner:
+            assert inner.resolve("root") == 1
+            assert inner.resolve("scoped") == 2
+            assert inner.has("root")
+            assert not inner.has("missing")
+            with pytest.raises(KeyError):
+                inner.resolve("missing")
+
+
+def test_destroy_only_walks_parents_when_recursive():
+    root = DependencyContainer()
+    root.register("key", 1)
+    scoped = root.scoped()
+    with pytest.raises(KeyError):
+        scoped.destroy("key")
+    assert root.has("key")
+
+    scoped.destroy("key", recursive=True)
+    assert not root.has("key")
+    with pytest.raises(KeyError):
+        scoped.destroy("key", recursive=True)
+
+
+def test_register_none_value():
+    container = DependencyContainer()
+    container.register("optional", None)
+    assert container.has("optional")
+    assert container.resolve("optional") is None
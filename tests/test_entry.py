@@ -0,0 +1,53 @@
+import asyncio
+import os
+import signal
+import sys
+from itertools import count
+
+import pytest
+
+from kirara_ai import entry
+from kirara_ai.entry import _is_newer_version, _parse_semver
+
+
+# ==================== 测试用例 ====================
+def test_parse_semver():
+    assert _parse_semver("3.10.2") == (3, 10, 2)
+    assert _parse_semver("3.3.0a2") is None
+    assert _parse_semver("3.3") is None
+
+
+@pytest.mark.parametrize(
+    "latest, current, expected",
+    [
+        ("3.10.0", "3.9.1", True),
+        ("3.2.9", "3.3.0", False),
+        ("3.3.0", "3.3.0", False),
+        # 预发布版本回退到 packaging 比较
+        ("3.3.0", "3.3.0a2", True),
+        ("3.3.0a1", "3.3.0a2", False),
+    ],
+)
+def test_is_newer_version(latest, current, expected):
+    assert _is_newer_version(latest, current) is expected
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Windows 的事件循环不支持 add_signal_handler")
+def test_signals_after_first_bypass_event_loop(monkeypatch):
+    monkeypatch.setattr(entry, "_interrupt_counter", count(1))
+    event = asyncio.Event()
+    monkeypatch.setattr(entry, "shutdown_event", event)
+    previous = signal.getsignal(signal.SIGINT)
+    loop = asyncio.new_event_loop()
+    try:
+        loop.add_signal_handler(signal.SIGINT, entry._handle_first_signal, loop, (signal.SIGINT,))
+        loop.call_soon(os.kill, os.getpid(), signal.SIGINT)
+        loop.run_until_complete(asyncio.wait_for(event.wait(), 1))
+        assert signal.getsignal(signal.SIGINT) is entry._signal_handler
+
+        # 事件循环没有运行时，再次中断仍会被直接处理
+        os.kill(os.getpid(), signal.SIGINT)
+        assert next(entry._interrupt_counter) == 3
+    finally:
+        signal.signal(signal.SIGINT, previous)
+        loop.close()
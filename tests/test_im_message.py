@@ -0,0 +1,74 @@
+from pathlib import Path
+
+import pytest
+
+from kirara_ai.im.message import (AtElement, EmojiMessage, ImageMessage, IMMessage, JsonMessage, MentionElement,
+                                  MessageElement, ReplyElement, TextMessage)
+from kirara_ai.im.sender import ChatSender
+
+ELEMENTS = [
+    TextMessage("hello"),
+    AtElement("10001", "Alice"),
+    MentionElement(ChatSender.from_c2c_chat(user_id="10002", display_name="Bob")),
+    ReplyElement("msg-1"),
+    JsonMessage('{"a": 1}'),
+    EmojiMessage("14"),
+]
+
+
+# ==================== 测试用例 ====================
+@pytest.mark.parametrize("element", ELEMENTS, ids=lambda e: type(e).__name__)
+def test_to_dict_matches_element_methods(element: MessageElement):
+    message = IMMessage(sender=ChatSender.get_bot_sender(), message_elements=[element])
+    result = message.to_dict()
+    assert result["message_elements"] == [element.to_dict()]
+    assert result["plain_text"] == element.to_plain()
+
+
+def test_subclass_falls_back_to_own_methods():
+    class UpperTextMessage(TextMessage):
+        def to_plain(self):
+            return self.text.upper()
+
+    message = IMMessage(sender=ChatSender.get_bot_sender(), message_elements=[UpperTextMessage("hi")])
+    assert message.content == "HI"
+
+
+def test_content_cache_follows_element_changes():
+    message = IMMessage(sender=ChatSender.get_bot_sender(), message_elements=[TextMessage("hello")])
+    assert message.content == "hello"
+    assert message.content is message.content
+
+    message.message_elements.append(TextMessage("world"))
+    assert message.content == "hello\nworld"
+
+    message.message_elements = [EmojiMessage("14")]
+    assert message.content == "[Face:14]"
+    assert message.images == []
+
+
+@pytest.mark.asyncio
+async def test_media_path_checked_once(tmp_path, monkeypatch):
+    file_path = tmp_path / "image.png"
+    file_path.write_bytes(b"data")
+    message = ImageMessage(path=str(file_path), media_id="media-1")
+
+    calls = []
+    original_exists = Path.exists
+    monkeypatch.setattr(Path, "exists", lambda self: calls.append(self) or original_exists(self))
+
+    assert await message.get_path() == str(file_path)
+    assert await message.get_path() == str(file_path)
+    assert len(calls) == 1
+
+    # 重新设置路径后需要再次检查
+    message.path = str(file_path)
+    await message.get_path()
+    assert len(calls) == 2
+
+
+def test_text_only_content_matches_mixed_path():
+    texts = [" first ", "second", ""]
+    message = IMMessage(sender=ChatSender.get_bot_sender(), message_elements=[TextMessage(t) for t in texts])
+    expected = "".join(t + "\n" for t in texts).strip()
+    assert message.content == expected
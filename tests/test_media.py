@@ -1,12 +1,18 @@
 import asyncio
+import base64
+import hashlib
+import json
 import os
 import shutil
+import sqlite3
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import MagicMock
 
 from kirara_ai.im.message import ImageMessage, VoiceMessage
-from kirara_ai.media import MediaManager, MediaType
+from kirara_ai.media import MediaManager, MediaMetadata, MediaType
+from kirara_ai.media.utils.mime import detect_mime_type
 
 
 class TestMediaManager(unittest.TestCase):
@@ -164,6 +170,33 @@ class TestMediaManager(unittest.TestCase):
         self.assertIsNotNone(metadata.media_type)
         self.assertIsNotNone(metadata.format)
 
+    def test_register_many(self):
+        """测试批量注册媒体"""
+        specs = [
+            {"path": self.format_files["png"], "reference_id": "batch_ref"},
+            {"url": f"file://{Path(self.format_files['gif']).absolute()}", "reference_id": "batch_ref"},
+            {"path": self.format_files["mp3"], "reference_id": "batch_ref"},
+        ]
+
+        media_ids = asyncio.run(self.media_manager.register_many(specs, limit=2))
+
+        # 返回顺序与输入一致
+        self.assertEqual(len(media_ids), 3)
+        self.assertEqual(self.media_manager.get_metadata(media_ids[0]).format, "png")
+        self.assertEqual(self.media_manager.get_metadata(media_ids[1]).format, "gif")
+        self.assertEqual(self.media_manager.get_metadata(media_ids[2]).media_type, MediaType.AUDIO)
+
+    def test_base64_url(self):
+        """测试流式编码的 base64 URL 与一次性编码结果一致"""
+        media_id = asyncio.run(self.media_manager.register_from_path(self.format_files["png"]))
+        with open(self.format_files["png"], "rb") as f:
+            expected = base64.b64encode(f.read()).decode()
+
+        base64_url = asyncio.run(self.media_manager.get_base64_url(media_id))
+        self.assertEqual(base64_url, f"data:image/png;base64,{expected}")
+        self.assertEqual(asyncio.run(self.media_manager.get_media(media_id).get_base64()), expected)
+        self.assertIsNone(asyncio.run(self.media_manager.get_base64("missing")))
+
     def test_format_detection(self):
         """测试不同格式文件的类型检测"""
         # 图片格式测试
@@ -237,6 +270,222 @@ class TestMediaManager(unittest.TestCase):
         # 验证媒体是否被删除
         self.assertIsNone(self.media_manager.get_metadata(media_id))
 
+    def test_cleanup_unreferenced(self):
+        """测试清理无引用媒体"""
+        referenced_id = asyncio.run(self.media_manager.register_from_path(
+            self.test_image_path,
+            reference_id="ref1"
+        ))
+        unreferenced_id = asyncio.run(self.media_manager.register_from_path(self.test_audio_path))
+        self.assertEqual(self.media_manager.get_unreferenced_media_ids(), {unreferenced_id})
+
+        # 添加引用后不再被视为无引用媒体
+        self.media_manager.add_reference(unreferenced_id, "ref2")
+        self.assertEqual(self.media_manager.get_unreferenced_media_ids(), set())
+        self.media_manager.remove_reference(unreferenced_id, "ref2")
+        self.assertIsNone(self.media_manager.get_metadata(unreferenced_id))
+
+        # 重新加载元数据后索引保持一致
+        unreferenced_id = asyncio.run(self.media_manager.register_from_path(self.test_audio_path))
+        reloaded = MediaManager(media_dir=self.media_dir)
+        self.assertEqual(reloaded.get_unreferenced_media_ids(), {unreferenced_id})
+
+        self.assertEqual(reloaded.cleanup_unreferenced(), 1)
+        self.assertIsNone(reloaded.get_metadata(unreferenced_id))
+        self.assertIsNotNone(reloaded.get_metadata(referenced_id))
+        self.assertEqual(reloaded.get_unreferenced_media_ids(), set())
+
+    def test_migrate_json_metadata(self):
+        """测试旧版本 JSON 元数据迁移到数据库"""
+        media_id = asyncio.run(self.media_manager.register_from_path(
+            self.test_image_path,
+            tags=["legacy"],
+            reference_id="ref1"
+        ))
+        metadata = self.media_manager.get_metadata(media_id)
+        legacy_file = Path(self.media_dir) / "metadata" / "legacy.json"
+        legacy_data = dict(metadata.to_dict(), media_id="legacy")
+        legacy_file.write_text(json.dumps(legacy_data), encoding="utf-8")
+
+        reloaded = MediaManager(media_dir=self.media_dir)
+        self.assertFalse(legacy_file.exists())
+        # 原文件改名保留，以便降级或数据库损坏时恢复
+        self.assertTrue(legacy_file.with_name("legacy.json.migrated").exists())
+        self.assertEqual(reloaded.get_metadata("legacy").tags, ["legacy"])
+        self.assertEqual(reloaded.get_metadata("legacy").references, {"ref1"})
+        self.assertIsNotNone(reloaded.get_metadata(media_id))
+
+        # 删除后重新加载不会再出现
+        reloaded.delete_media("legacy")
+        reloaded = MediaManager(media_dir=self.media_dir)
+        self.assertIsNone(reloaded.get_metadata("legacy"))
+
+    def test_detect_mime_type(self):
+        """测试按文件路径和内存数据检测的 MIME 类型一致"""
+        for format_name, path in self.format_files.items():
+            with open(path, "rb") as f:
+                data = f.read()
+            self.assertEqual(detect_mime_type(path=path), detect_mime_type(data=data), format_name)
+        self.assertEqual(detect_mime_type(path=self.format_files["png"])[1], MediaType.IMAGE)
+
+    def test_mime_type_persisted(self):
+        """测试检测到的 MIME 类型随元数据保存"""
+        media_id = asyncio.run(self.media_manager.register_from_path(self.format_files["pdf"]))
+        self.assertEqual(self.media_manager.get_metadata(media_id).mime_type, "application/pdf")
+        self.assertEqual(self.media_manager.get_media(media_id).mime_type, "application/pdf")
+
+        reloaded = MediaManager(media_dir=self.media_dir)
+        self.assertEqual(reloaded.get_metadata(media_id).mime_type, "application/pdf")
+
+        # 未检测过的元数据根据媒体类型和格式推断
+        metadata = MediaMetadata(media_id="media1", media_type=MediaType.IMAGE, format="png")
+        self.assertEqual(metadata.mime_type, "image/png")
+        self.assertNotIn("mime_type", metadata.to_dict())
+
+    def test_ensure_file_exists_copies_from_path(self):
+        """测试媒体文件丢失时从原始路径复制"""
+        media_id = asyncio.run(self.media_manager.register_from_path(self.test_image_path))
+        stored_path = Path(self.media_manager.get_metadata(media_id).path)
+        self.media_manager.update_metadata(media_id, path=self.test_image_path)
+        stored_path.unlink()
+
+        restored_path = asyncio.run(self.media_manager.ensure_file_exists(media_id))
+        self.assertEqual(restored_path, stored_path)
+        self.assertEqual(restored_path.read_bytes(), Path(self.test_image_path).read_bytes())
+
+    def test_ensure_file_exists_failed_download(self):
+        """测试下载失败时不会留下不完整的媒体文件"""
+        media_id = asyncio.run(self.media_manager.register_from_path(self.test_image_path))
+        metadata = self.media_manager.get_metadata(media_id)
+        stored_path = Path(metadata.path)
+        stored_path.unlink()
+        metadata.path = None
+        metadata.url = "file:///nonexistent/x.png"
+
+        for _ in range(2):
+            self.assertIsNone(asyncio.run(self.media_manager.ensure_file_exists(media_id)))
+            self.assertFalse(stored_path.exists())
+        self.assertEqual(list(Path(self.media_manager.files_dir).glob(".*.download")), [])
+
+    def test_file_path_cache(self):
+        """测试文件路径缓存及其失效"""
+        media_id = asyncio.run(self.media_manager.register_from_path(self.test_image_path))
+        stored_path = asyncio.run(self.media_manager.get_file_path(media_id))
+        self.assertEqual(stored_path, Path(self.media_manager.get_metadata(media_id).path))
+        self.assertIn(media_id, self.media_manager._path_cache)
+
+        # 修改路径后缓存失效
+        self.media_manager.update_metadata(media_id, path=self.test_image_path)
+        self.assertNotIn(media_id, self.media_manager._path_cache)
+        self.assertEqual(asyncio.run(self.media_manager.get_file_path(media_id)), Path(self.test_image_path))
+
+        # 删除媒体后缓存失效
+        self.media_manager.delete_media(media_id)
+        self.assertNotIn(media_id, self.media_manager._path_cache)
+        self.assertIsNone(asyncio.run(self.media_manager.get_file_path(media_id)))
+
+    def test_register_large_file(self):
+        """测试流式注册超过单个读取块大小的文件"""
+        large_path = os.path.join(self.temp_dir, "large.png")
+        with open(self.format_files["png"], "rb") as f:
+            content = f.read() + os.urandom(200 * 1024)
+        with open(large_path, "wb") as f:
+            f.write(content)
+
+        media_id = asyncio.run(self.media_manager.register_from_path(large_path))
+        self.assertEqual(media_id, hashlib.sha1(content).hexdigest())
+        metadata = self.media_manager.get_metadata(media_id)
+        self.assertEqual(metadata.size, len(content))
+        self.assertEqual(metadata.format, "png")
+        self.assertEqual(Path(metadata.path).read_bytes(), content)
+
+    def test_register_large_data(self):
+        """测试注册较大的内存数据时文件内容完整"""
+        with open(self.format_files["png"], "rb") as f:
+            content = f.read() + os.urandom(300 * 1024)
+
+        media_id = asyncio.run(self.media_manager.register_from_data(content))
+        metadata = self.media_manager.get_metadata(media_id)
+        self.assertEqual(metadata.size, len(content))
+        self.assertEqual(Path(metadata.path).read_bytes(), content)
+
+        # bytearray 和 memoryview 与 bytes 得到相同的媒体
+        self.assertEqual(asyncio.run(self.media_manager.register_from_data(bytearray(content))), media_id)
+        self.assertEqual(asyncio.run(self.media_manager.register_from_data(memoryview(content))), media_id)
+        self.media_manager.delete_media(media_id)
+        media_id = asyncio.run(self.media_manager.register_from_data(memoryview(bytearray(content))))
+        self.assertEqual(self.media_manager.get_metadata(media_id).format, "png")
+        self.assertEqual(Path(self.media_manager.get_metadata(media_id).path).read_bytes(), content)
+
+    def test_flush_metadata(self):
+        """测试元数据延迟合并写入"""
+        media_id = asyncio.run(self.media_manager.register_from_path(self.test_image_path))
+        self.media_manager.flush_metadata()
+
+        self.media_manager.add_tags(media_id, ["a"])
+        self.media_manager.add_tags(media_id, ["b"])
+        self.media_manager.add_reference(media_id, "ref1")
+
+        db_path = os.path.join(self.media_dir, "metadata.db")
+        def stored_metadata():
+            with sqlite3.connect(db_path) as db:
+                row = db.execute("SELECT data FROM media WHERE media_id = ?", (media_id,)).fetchone()
+            return MediaMetadata.from_json(row[0])
+
+        # 修改先写入缓存，数据库中仍是旧数据
+        self.assertEqual(stored_metadata().tags, [])
+        self.media_manager.flush_metadata()
+        self.assertEqual(stored_metadata().tags, ["a", "b"])
+        self.assertEqual(stored_metadata().references, {"ref1"})
+
+        # 重新初始化前会写入尚未保存的修改
+        self.media_manager.update_metadata(media_id, description="updated")
+        reloaded = MediaManager(media_dir=self.media_dir)
+        self.assertEqual(reloaded.get_metadata(media_id).description, "updated")
+
+    def test_flush_metadata_retries_after_failure(self):
+        """测试写入失败的元数据会保留下来等待重试"""
+        media_id = asyncio.run(self.media_manager.register_from_path(self.test_image_path))
+        self.media_manager.flush_metadata()
+        self.media_manager.add_tags(media_id, ["a"])
+        # 保存后原地修改元数据，不影响已排队写入的数据
+        self.media_manager.get_metadata(media_id).tags.append("unsaved")
+
+        db = self.media_manager._db
+        broken = MagicMock()
+        broken.__enter__.return_value = broken
+        broken.executemany.side_effect = RuntimeError("set changed size during iteration")
+        self.media_manager._db = broken
+        try:
+            self.media_manager.flush_metadata()
+        finally:
+            self.media_manager._db = db
+        self.assertIn(media_id, self.media_manager._dirty)
+
+        self.media_manager.flush_metadata()
+        with sqlite3.connect(os.path.join(self.media_dir, "metadata.db")) as conn:
+            row = conn.execute("SELECT data FROM media WHERE media_id = ?", (media_id,)).fetchone()
+        self.assertEqual(MediaMetadata.from_json(row[0]).tags, ["a"])
+
+    def test_metadata_json_roundtrip(self):
+        """测试元数据 JSON 序列化"""
+        metadata = MediaMetadata(
+            media_id="media1",
+            media_type=MediaType.IMAGE,
+            format="png",
+            size=10,
+            description="测试图片",
+            tags=["a", "b"],
+            references={"ref1", "ref2"},
+        )
+        loaded = MediaMetadata.from_json(metadata.to_json())
+        self.assertEqual(loaded.to_dict(), dict(metadata.to_dict(), references=list(loaded.references)))
+        self.assertEqual(loaded.references, {"ref1", "ref2"})
+        self.assertEqual(loaded.created_at, metadata.created_at)
+        self.assertIn("测试图片", metadata.to_json().decode("utf-8"))
+        # 重复的标签共享同一个字符串对象
+        self.assertIs(loaded.tags[0], metadata.tags[0])
+
     def test_search(self):
         """测试搜索功能"""
         # 注册多个媒体
@@ -278,6 +527,26 @@ class TestMediaManager(unittest.TestCase):
         results = self.media_manager.search_by_type(MediaType.AUDIO)
         self.assertEqual(results, [media_id2])
 
+        # 匹配全部标签
+        self.assertEqual(self.media_manager.search_by_tags(["tag1", "common"], match_all=True), [media_id1])
+        self.assertEqual(self.media_manager.search_by_tags(["tag1", "tag2"], match_all=True), [])
+        self.assertEqual(self.media_manager.search_by_tags(["tag1", "tag2"]), [media_id1, media_id2])
+        self.assertEqual(self.media_manager.search_by_source("SOURCE"), [media_id1, media_id2])
+
+        # 修改标签和来源后索引同步更新
+        self.media_manager.remove_tags(media_id1, ["common"])
+        self.media_manager.add_tags(media_id1, ["new"])
+        self.media_manager.update_metadata(media_id2, source="other")
+        self.assertEqual(self.media_manager.search_by_tags(["common"]), [media_id2])
+        self.assertEqual(self.media_manager.search_by_tags(["new"]), [media_id1])
+        self.assertEqual(self.media_manager.search_by_source("source"), [media_id1])
+
+        # 删除后不再出现在搜索结果中
+        self.media_manager.delete_media(media_id2)
+        self.assertEqual(self.media_manager.search_by_tags(["common", "tag2"]), [])
+        self.assertEqual(self.media_manager.search_by_type(MediaType.AUDIO), [])
+        self.assertEqual(self.media_manager.search_by_source("other"), [])
+
     def test_media_message(self):
         """测试MediaMessage类"""
         # 创建只有URL的媒体消息
@@ -0,0 +1,51 @@
+import asyncio
+import os
+import shutil
+import tempfile
+
+import pytest
+
+from kirara_ai.ioc.container import DependencyContainer
+from kirara_ai.media.carrier import MediaCarrierRegistry, MediaCarrierService
+from kirara_ai.media.manager import MediaManager
+
+
+# ==================== Fixtures ====================
+@pytest.fixture
+def media_manager():
+    temp_dir = tempfile.mkdtemp()
+    yield MediaManager(media_dir=os.path.join(temp_dir, "media"))
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def carrier_service(media_manager):
+    container = DependencyContainer()
+    container.register(MediaCarrierRegistry, MediaCarrierRegistry(container))
+    return MediaCarrierService(container, media_manager)
+
+
+def register(media_manager: MediaManager, data: bytes) -> str:
+    return asyncio.run(media_manager.register_from_data(data, format="txt", reference_id="seed"))
+
+
+# ==================== 测试用例 ====================
+def test_get_references_by_media(media_manager, carrier_service):
+    first = register(media_manager, b"first")
+    second = register(media_manager, b"second")
+    carrier_service.register_reference(first, "memory", "chat:1")
+    carrier_service.register_reference(first, "workflow", "wf")
+    carrier_service.register_reference(second, "memory", "chat:2")
+
+    assert sorted(carrier_service.get_references_by_media(first)) == [("memory", "chat:1"), ("workflow", "wf")]
+    assert carrier_service.get_references_by_media(second) == [("memory", "chat:2")]
+    assert carrier_service.get_references_by_media("missing") == []
+
+
+def test_get_media_by_reference(media_manager, carrier_service):
+    media_id = register(media_manager, b"first")
+    carrier_service.register_reference(media_id, "memory", "chat:1")
+
+    assert [media.media_id for media in carrier_service.get_media_by_reference("memory", "chat:1")] == [media_id]
+    assert carrier_service.get_media_by_reference("memory", "chat:2") == []
+    assert carrier_service.get_media_by_reference("workflow", "chat:1") == []
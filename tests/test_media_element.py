@@ -4,7 +4,7 @@ from unittest.mock import patch
 
 import pytest
 
-from kirara_ai.im.message import ImageMessage
+from kirara_ai.im.message import ImageMessage, MediaMessage, VoiceMessage
 from kirara_ai.media.manager import MediaManager
 
 # 测试资源路径
@@ -14,8 +14,12 @@ TEST_URL = "https://httpbin.org/image/jpeg"  # 一个可用的测试图片URL
 temp_dir = tempfile.mkdtemp()
 media_dir = os.path.join(temp_dir, "media")
 
-# 创建媒体管理器
-media_manager = MediaManager(media_dir=media_dir)
+
+@pytest.fixture(autouse=True)
+def media_manager():
+    # 媒体消息复用全局的 MediaManager 单例，其他测试可能已将其指向已删除的临时目录，这里重新初始化
+    return MediaManager(media_dir=media_dir)
+
 
 @pytest.mark.asyncio
 async def test_media_element_from_path():
@@ -98,7 +102,29 @@ async def test_media_element_errors():
         
     with pytest.raises(ValueError):
         # 使用mock模拟网络请求失败
-        with patch('curl_cffi.AsyncSession.get') as mock_get:
+        with patch('aiohttp.ClientSession.get') as mock_get:
             mock_get.side_effect = ValueError("Mocked network error")
             media = ImageMessage(url="https://valid-url-but-will-fail.com/image.jpg")
-            await media.get_data()  # 模拟网络请求失败
\ No newline at end of file
+            await media.get_data()  # 模拟网络请求失败
+
+@pytest.mark.asyncio
+async def test_media_element_create_many():
+    # 测试批量构造媒体消息
+    with open(TEST_RESOURCE_PATH, "rb") as f:
+        data = f.read()
+    existing = ImageMessage(data=data)
+
+    elements = MediaMessage.create_many([
+        (ImageMessage, {"path": TEST_RESOURCE_PATH}),
+        (ImageMessage, {"media_id": existing.media_id}),
+        (VoiceMessage, {"data": data, "description": "batch"}),
+    ])
+
+    assert [type(e) for e in elements] == [ImageMessage, ImageMessage, VoiceMessage]
+    assert all(e.media_id for e in elements)
+    assert elements[1].media_id == existing.media_id
+    assert elements[0].format == existing.format
+    assert await elements[0].get_data() == data
+
+    with pytest.raises(TypeError):
+        MediaMessage.create_many([(ImageMessage, {"unknown": 1})])
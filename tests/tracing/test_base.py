@@ -6,7 +6,7 @@ from sqlalchemy import Column, Integer
 
 from kirara_ai.config.global_config import GlobalConfig
 from kirara_ai.database import DatabaseManager
-from kirara_ai.database.manager import Base
+from kirara_ai.database.base import Base
 from kirara_ai.events.event_bus import EventBus
 from kirara_ai.ioc.container import DependencyContainer
 from kirara_ai.llm.format.message import LLMChatMessage, LLMChatTextContent
@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
@@ -8,6 +8,7 @@ from kirara_ai.im.manager import IMManager
 from kirara_ai.ioc.container import DependencyContainer
 from kirara_ai.llm.llm_manager import LLMManager
 from kirara_ai.plugin_manager.plugin_loader import PluginLoader
+from kirara_ai.web.api.system.utils import get_latest_pypi_version_cached
 from kirara_ai.web.app import WebServer
 from kirara_ai.workflow.core.workflow import WorkflowRegistry
 from tests.utils.auth_test_utils import auth_headers, setup_auth_service  # noqa
@@ -137,4 +138,32 @@ class TestSystemStatus:
         assert data["latest_backend_version"] != "0.0.0"
         assert data["backend_update_available"] == False
         assert data["latest_webui_version"] != "0.0.0"
-        assert data["webui_download_url"] != ""
\ No newline at end of file
+        assert data["webui_download_url"] != ""
+
+class TestPypiVersionCache:
+    @pytest.mark.asyncio
+    async def test_cached_version_within_ttl(self, tmp_path):
+        """测试缓存有效期内不再请求 PyPI"""
+        cache_file = str(tmp_path / ".pypi_cache.json")
+        with patch(
+            "kirara_ai.web.api.system.utils.get_latest_pypi_version",
+            new=AsyncMock(return_value=("1.2.3", "https://example.com/pkg.whl")),
+        ) as mock_fetch:
+            assert await get_latest_pypi_version_cached("kirara-ai", cache_file, 3600) == ("1.2.3", "https://example.com/pkg.whl")
+            assert await get_latest_pypi_version_cached("kirara-ai", cache_file, 3600) == ("1.2.3", "https://example.com/pkg.whl")
+            assert mock_fetch.await_count == 1
+
+            # 缓存过期后重新请求
+            await get_latest_pypi_version_cached("kirara-ai", cache_file, 0)
+            assert mock_fetch.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_failed_lookup_not_cached(self, tmp_path):
+        """测试请求失败的结果不会被缓存"""
+        cache_file = tmp_path / ".pypi_cache.json"
+        with patch(
+            "kirara_ai.web.api.system.utils.get_latest_pypi_version",
+            new=AsyncMock(return_value=("0.0.0", "")),
+        ):
+            assert await get_latest_pypi_version_cached("kirara-ai", str(cache_file), 3600) == ("0.0.0", "")
+        assert not cache_file.exists()